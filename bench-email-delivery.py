@@ -0,0 +1,106 @@
+import os
+import time
+import random
+import argparse
+import tempfile
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from wps_canvas_export.delivery import AttachmentSource, LocalSMTPServer, iter_message_chunks, open_delivery
+
+# Measures email delivery throughput and per-message latency of the delivery backends with
+# synthetic reports, without touching Gmail:
+#   python bench-email-delivery.py --messages 500 --backends local,maildir,mbox
+# "local" sends over one connection to an in-process SMTP server, "local-reconnect" opens a new
+# connection for every message (the cost of not reusing the session). --smtp-host benchmarks a
+# real SMTP server instead (e.g. a local relay), --reply-delay-ms makes the in-process server slower.
+
+def make_report_files(directory, count, size_kb):
+    """count synthetic HTML reports of about size_kb each"""
+    rng = random.Random(42)
+    filenames = []
+    for i in range(count):
+        filename = os.path.join(directory, f"Student {i}.html")
+        rows = []
+        while sum(len(row) for row in rows) < size_kb * 1024:
+            rows.append(f"<tr><td>Assignment {rng.randrange(10**6)}</td><td>{rng.random() * 100:.1f}%</td></tr>\n")
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("<html><body><table>\n" + "".join(rows) + "</table></body></html>\n")
+        filenames.append(filename)
+    return filenames
+
+def build_message(index, report_files):
+    headers = {"From": "bench@localhost", "To": f"parent{index}@localhost", "Subject": f"📚 Benchmark report {index}"}
+    body = MIMEMultipart('alternative')
+    body.attach(MIMEText(f"Benchmark message {index}\n" * 20, 'plain'))
+    body.attach(MIMEText(f"<p>Benchmark message {index}</p>\n" * 20, 'html'))
+    parts = [body] + [AttachmentSource(os.path.basename(filename), filename) for filename in report_files]
+    return headers, parts
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run_backend(label, make_delivery, messages, report_files, reconnect=False):
+    delivery = make_delivery()
+    latencies = []
+    total_bytes = 0
+    start = time.perf_counter()
+    try:
+        delivery.connect()
+        for index in range(messages):
+            headers, parts = build_message(index, report_files)
+            message_start = time.perf_counter()
+            if reconnect:
+                delivery.close()
+                delivery.connect()
+            size, _ = delivery.send([headers["To"]], lambda: iter_message_chunks(headers, parts))
+            latencies.append(time.perf_counter() - message_start)
+            total_bytes += size
+    finally:
+        delivery.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<18} {messages:>6} {elapsed:>8.2f} {messages / elapsed:>8.1f} {total_bytes / elapsed / 1024 / 1024:>7.1f}"
+        f" {percentile(latencies, 0.5) * 1000:>7.2f} {percentile(latencies, 0.95) * 1000:>7.2f} {max(latencies) * 1000:>7.2f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email delivery backends with synthetic reports")
+    parser.add_argument("--messages", type=int, default=200, help="messages sent per backend")
+    parser.add_argument("--attachments", type=int, default=4, help="report files attached to every message")
+    parser.add_argument("--attachment-kb", type=int, default=50, help="size of every report file")
+    parser.add_argument("--backends", default="local,local-reconnect,maildir,mbox",
+                        help="comma-separated: local, local-reconnect, maildir, mbox, smtp")
+    parser.add_argument("--reply-delay-ms", type=float, default=0, help="in-process server delay before acknowledging a message")
+    parser.add_argument("--smtp-host", default="127.0.0.1", help="host for the smtp backend")
+    parser.add_argument("--smtp-port", type=int, default=25, help="port for the smtp backend")
+    parser.add_argument("--starttls", action="store_true", help="use STARTTLS for the smtp backend")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        report_files = make_report_files(directory, args.attachments, args.attachment_kb)
+        local_server = LocalSMTPServer(reply_delay=args.reply_delay_ms / 1000)
+        host, port = local_server.start()
+        backends = {
+            "local": lambda: open_delivery("smtp", "bench@localhost", host=host, port=port, starttls=False),
+            "local-reconnect": lambda: open_delivery("smtp", "bench@localhost", host=host, port=port, starttls=False),
+            "maildir": lambda: open_delivery("maildir", "bench@localhost", path=os.path.join(directory, "Maildir")),
+            "mbox": lambda: open_delivery("mbox", "bench@localhost", path=os.path.join(directory, "bench.mbox")),
+            "smtp": lambda: open_delivery("smtp", "bench@localhost", host=args.smtp_host, port=args.smtp_port, starttls=args.starttls),
+        }
+
+        print(f"{args.messages} messages, {args.attachments} x {args.attachment_kb} KB attachments each")
+        print(f"{'backend':<18} {'msgs':>6} {'total s':>8} {'msg/s':>8} {'MB/s':>7} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7}")
+        try:
+            for label in args.backends.split(","):
+                label = label.strip()
+                if label not in backends:
+                    print(f"⚠️ Unknown backend: {label}")
+                    continue
+                run_backend(label, backends[label], args.messages, report_files, reconnect=label == "local-reconnect")
+        finally:
+            local_server.stop()
+        print(f"In-process server received {local_server.message_count} messages, {local_server.byte_count / 1024 / 1024:.1f} MB")
+
+if __name__ == "__main__":
+    main()
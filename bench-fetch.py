@@ -0,0 +1,71 @@
+import time
+import argparse
+from wps_canvas_export import FETCH_BACKENDS, CanvasClient, fetch
+
+# Compares the Canvas fetch backends on the account in CANVAS_API_URL / CANVAS_API_KEY:
+#   python bench-fetch.py --runs 3 --backends rest,graphql
+# Every backend fetches all observees --runs times over one client (so keep-alive connections
+# are reused after the first run), without the HTTP cache unless --http-cache is given and
+# without touching the incremental sync state. Prints requests and latency per fetch, and
+# whether every backend returned the same data as the first one.
+
+def normalized(data):
+    """data with assignments ordered by id, the backends may list them in a different order"""
+    return {
+        student_id: {
+            "name": student["name"],
+            "courses": {
+                course_id: dict(course, assignments=sorted(course["assignments"], key=lambda a: a.id))
+                for course_id, course in student["courses"].items()
+            }
+        }
+        for student_id, student in data.items()
+    }
+
+def run_backend(backend, runs, http_cache):
+    client = CanvasClient(http_cache=http_cache)
+    latencies = []
+    requests = []
+    connections = 0
+    try:
+        for _ in range(runs):
+            before = dict(client.transport.stats)
+            start = time.perf_counter()
+            snapshot = fetch(client, backend=backend, incremental=False)
+            latencies.append(time.perf_counter() - start)
+            requests.append(client.transport.stats["requests"] - before["requests"])
+            connections += client.transport.stats["connections"] - before["connections"]
+    finally:
+        client.close()
+    return snapshot.data, latencies, requests, connections
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Canvas fetch backends")
+    parser.add_argument("--runs", type=int, default=3, help="fetches per backend")
+    parser.add_argument("--backends", default=",".join(FETCH_BACKENDS), help=f"comma-separated: {', '.join(FETCH_BACKENDS)}")
+    parser.add_argument("--http-cache", action="store_true", help="fetch through the HTTP response cache in CACHE_DIR")
+    args = parser.parse_args()
+
+    results = []
+    reference = None
+    for backend in args.backends.split(","):
+        backend = backend.strip()
+        if backend not in FETCH_BACKENDS:
+            print(f"⚠️ Unknown backend: {backend}")
+            continue
+        data, latencies, requests, connections = run_backend(backend, args.runs, args.http_cache)
+        data = normalized(data)
+        if reference is None:
+            reference = data
+        results.append((backend, latencies, requests, connections, data == reference))
+
+    print(f"{args.runs} runs per backend")
+    print(f"{'backend':<10} {'req/run':>8} {'conns':>6} {'mean s':>8} {'min s':>8} {'max s':>8}  same data")
+    for backend, latencies, requests, connections, same in results:
+        print(
+            f"{backend:<10} {sum(requests) / len(requests):>8.1f} {connections:>6} {sum(latencies) / len(latencies):>8.3f}"
+            f" {min(latencies):>8.3f} {max(latencies):>8.3f}  {'yes' if same else 'NO'}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,12 @@ from email.message import EmailMessage
 
 def send_email_to_self(subject, body):
     user = os.environ['GMAIL_USER']
-    app_pass = os.environ['GMAIL_APP_PASS']
+    app_pass = os.environ.get('GMAIL_APP_PASS', '')
+    # SMTP_HOST / SMTP_PORT / SMTP_STARTTLS / SMTP_TIMEOUT point the test at another server, e.g. a local relay
+    host = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
+    port = int(os.environ.get('SMTP_PORT', '587'))
+    starttls = os.environ.get('SMTP_STARTTLS', 'true').lower() == 'true'
+    timeout = int(os.environ.get('SMTP_TIMEOUT', '60'))
 
     msg = EmailMessage()
     msg['From'] = user
@@ -13,13 +18,16 @@ def send_email_to_self(subject, body):
     msg.set_content(body)
 
     try:
-        with smtplib.SMTP('smtp.gmail.com', 587) as s:
-            s.starttls()
-            s.login(user, app_pass)
+        with smtplib.SMTP(host, port, timeout=timeout) as s:
+            if starttls:
+                s.starttls()
+            s.ehlo_or_helo_if_needed()
+            if s.has_extn('auth'):
+                s.login(user, app_pass)
             s.send_message(msg)
         print("✅ Email sent successfully!")
     except Exception as e:
         print(f"❌ Failed to send email: {e}")
 
 if __name__ == "__main__":
-    send_email_to_self("Test Email From GitHub", "Hello World")
\ No newline at end of file
+    send_email_to_self("Test Email From GitHub", "Hello World")
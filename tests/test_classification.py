@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from wps_canvas_export.classification import classify_student, classify_students_numpy
+from wps_canvas_export.model import Assignment, build_due_date_indexes, pacific
+
+pytest.importorskip("numpy")
+
+# Both 2026 DST changes in Pacific time: spring forward on March 8, fall back on November 1
+DST_CHANGES = (datetime(2026, 3, 8, 10, tzinfo=timezone.utc), datetime(2026, 11, 1, 9, tzinfo=timezone.utc))
+
+def assignments_around(change):
+    """Submitted / due times on a half hour grid from four days before to nine days after change"""
+    assignments = []
+    offsets = [timedelta(minutes=30 * i) for i in range(-4 * 48, 9 * 48, 7)]
+    for i, offset in enumerate(offsets):
+        moment = (change + offset).astimezone(pacific)
+        assignments.append(Assignment(i, f"Submitted {i}", None, 10, None, None, False, moment, None))
+        assignments.append(Assignment(i + 10000, f"Due {i}", moment, 10, None, None, i % 3 == 0, None, None))
+        assignments.append(Assignment(i + 20000, f"Graded {i}", moment, 10, i % 11, str(i % 11), False, moment, None))
+    return assignments
+
+@pytest.mark.parametrize("change", DST_CHANGES)
+def test_numpy_engine_matches_python_across_dst(change):
+    data = {1: {"name": "Student", "courses": {7: {"name": "Course", "assignments": assignments_around(change)}}}}
+    due_indexes = build_due_date_indexes(data)
+    for hours in range(-12, 8 * 24, 5):
+        current_time = (change + timedelta(hours=hours, minutes=30)).astimezone(pacific)
+        expected = classify_student(data[1], current_time, due_index=due_indexes[1])
+        assert classify_students_numpy(data, current_time, due_indexes)[1] == expected, current_time
+
+def test_grading_window_uses_wall_clock_days():
+    submitted = datetime(2026, 3, 6, 12, 30, tzinfo=timezone.utc).astimezone(pacific)
+    current_time = datetime(2026, 3, 9, 12, tzinfo=timezone.utc).astimezone(pacific)
+    assignment = Assignment(1, "Essay", None, 10, None, None, False, submitted, None)
+    data = {1: {"name": "Student", "courses": {7: {"name": "Course", "assignments": [assignment]}}}}
+    summary = classify_students_numpy(data, current_time, build_due_date_indexes(data))[1]
+    assert summary["courses"][7][0].state == "grading-overdue"
+    assert summary == classify_student(data[1], current_time)
@@ -0,0 +1,22 @@
+"""Canvas observer reports for parents: fetch every observee's courses, classify the
+assignments, render the HTML / action items reports and email them.
+
+The command line entry point is `python -m wps_canvas_export` (or canvas-integration.py),
+configured by environment variables. The stages can also be driven from Python:
+
+    from wps_canvas_export import CanvasClient, classify, fetch, render
+
+    client = CanvasClient()
+    snapshot = classify(fetch(client))
+    html = render(snapshot, "html")
+"""
+from .api import (
+    FETCH_BACKENDS, RENDER_FORMATS, CanvasClient, EmailSettings, classify, deliver, fetch, load, render, write_reports
+)
+from .model import Assignment, Snapshot
+from .store import SnapshotStore, open_snapshot_store
+
+__all__ = [
+    "Assignment", "CanvasClient", "EmailSettings", "FETCH_BACKENDS", "RENDER_FORMATS", "Snapshot", "SnapshotStore",
+    "classify", "deliver", "fetch", "load", "open_snapshot_store", "render", "write_reports",
+]
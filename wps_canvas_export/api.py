@@ -0,0 +1,200 @@
+import os
+from dataclasses import replace
+from datetime import datetime, timezone
+from canvasapi import Canvas
+from .classification import classify_students
+from .config import (
+    CANVAS_API_KEY, CANVAS_API_URL, CANVAS_RECORD, CANVAS_REPLAY, CANVAS_REPLAY_LATENCY_MS, EMAIL_MODE, FETCH_BACKEND, FILTER_DUE_DATE_BEFORE, INCREMENTAL_SYNC, SNAPSHOT_HISTORY_RUNS, log
+)
+from .fetch import fetch_students_data, load_sync_state, save_sync_state
+from .fetch_graphql import fetch_students_data_graphql
+from .fixtures import FixtureRecorder, FixtureReplay
+from .http_cache import install_http_cache
+from .mail import EmailSettings, build_email_delta, generate_email_body_content, generate_email_body_html, send_email_report
+from .model import Snapshot, apply_due_date_filter, build_due_date_indexes
+from .rendering import (
+    generate_action_items_text_report, iter_html_report, save_html_report, save_individual_student_reports,
+    selected_students, snapshot_summaries, write_html_report, write_report_files
+)
+from .scheduler import install_request_scheduler
+from .transport import canvas_session
+
+# The pipeline stages: fetch() (or load()) -> classify() -> render() / write_reports() -> deliver().
+# Each stage takes and returns a Snapshot, so a long-lived process can run them on its own
+# schedule, reuse one CanvasClient across runs, and time every stage separately.
+
+class CanvasClient:
+    """The Canvas API client with the HTTP response cache and the pooled, rate-limited
+    transport installed, reusable across fetches (its keep-alive connections included).
+    http_cache=False leaves the response cache out, as for benchmarks.
+
+    record is a fixture archive that every response is recorded into (written by each
+    fetch), replay one that serves the responses instead of Canvas, so no credentials
+    are needed. A fixture holds exactly what came over the wire, the response cache
+    stays out of both.
+    """
+
+    def __init__(self, url=CANVAS_API_URL, key=CANVAS_API_KEY, http_cache=True,
+                 record=CANVAS_RECORD, replay=CANVAS_REPLAY, replay_latency=CANVAS_REPLAY_LATENCY_MS / 1000):
+        self.replay = FixtureReplay(replay, replay_latency) if replay else None
+        if self.replay:
+            # Nothing reaches Canvas, the recorded URL keeps the course links of the reports as they were
+            url = self.replay.canvas_url
+            key = key or "replay"
+        if not url: raise ValueError("CANVAS_API_URL environment variable is required i.e. https://myschool.instructure.com")
+        if not key: raise ValueError("CANVAS_API_KEY environment variable is required")
+        self.url = url
+        self.canvas = Canvas(url, key)
+        if (record or replay) and canvas_session(self.canvas) is None:
+            # A replay would reach Canvas after all, a recording would stay empty
+            raise ValueError("CANVAS_RECORD / CANVAS_REPLAY need canvasapi's request session, install the canvasapi version in requirements.txt")
+        self.http_cache = install_http_cache(self.canvas) if http_cache and not (record or replay) else None
+        self.transport = install_request_scheduler(self.canvas)
+        self.transport.replay = self.replay
+        self.recorder = FixtureRecorder(record, url) if record and not replay else None
+        self.transport.recorder = self.recorder
+
+    def close(self):
+        if self.http_cache:
+            self.http_cache.close()
+            self.http_cache = None
+        else:
+            session = canvas_session(self.canvas)
+            if session is not None:
+                session.close()
+
+FETCH_BACKENDS = {"rest": fetch_students_data, "graphql": fetch_students_data_graphql}
+
+def fetch(client=None, store=None, backend=FETCH_BACKEND, incremental=INCREMENTAL_SYNC):
+    """Fetch every observee's courses and submissions from Canvas, returns a Snapshot.
+
+    client is reused when given, otherwise one is made from the configuration and closed
+    afterwards. backend is one of FETCH_BACKENDS, both return the same data. When
+    incremental, the rest backend only requests what changed since the previous fetch
+    (unless the client records or replays fixtures).
+    When store is given (see open_snapshot_store) the snapshot is saved to it.
+    """
+    if backend not in FETCH_BACKENDS:
+        raise ValueError(f"Unknown fetch backend: '{backend}'. Expected one of {', '.join(FETCH_BACKENDS)}")
+    own_client = client is None
+    if own_client:
+        client = CanvasClient()
+    connections_before = dict(client.transport.stats)
+    try:
+        parent_user = client.canvas.get_user("self")
+        observees = parent_user.get_observees()
+        # A replayed run is taken at the time of its recording, so it renders exactly like the original
+        taken_at = client.replay.recorded_at if client.replay else datetime.now(timezone.utc)
+
+        print(f'ℹ️  Getting student data...')
+        # The since-filters depend on local state a recording could not be replayed against
+        sync_state = load_sync_state() if incremental and not (client.recorder or client.replay) else None
+        data = FETCH_BACKENDS[backend](client.canvas, observees, sync_state)
+        if sync_state is not None:
+            save_sync_state(sync_state)
+        if client.http_cache:
+            stats = client.http_cache.stats
+            log(f"🗄️ HTTP cache: {stats['fresh']} fresh, {stats['revalidated']} revalidated (304), {stats['fetched']} fetched")
+        stats = client.transport.scheduler.stats
+        log(
+            f"🚦 Canvas API: {stats['requests']} requests, {stats['retried']} retried, {stats['throttled']} throttled,"
+            f" concurrency {stats['min_concurrency']}-{client.transport.scheduler.max_concurrency}, lowest rate limit remaining {stats['min_remaining']}"
+        )
+        if client.replay:
+            log(f"📼 Replayed {client.replay.stats['served']} Canvas responses from {client.replay.path}, {client.replay.stats['missing']} not recorded")
+        # Connections of this fetch only, a reused client keeps its earlier ones open
+        stats = {key: value - connections_before[key] for key, value in client.transport.stats.items()}
+        log(
+            f"🔌 HTTP connections: {stats['connections']} opened ({stats['tls_handshakes']} TLS handshakes,"
+            f" {stats['connect_seconds'] * 1000:.0f} ms connecting) for {stats['requests']} requests"
+        )
+    finally:
+        # Saved even when the fetch failed, a failing run is worth reproducing too
+        if client.recorder:
+            try:
+                log(f"📼 Recorded {client.recorder.save()} Canvas responses to {client.recorder.path}")
+            except OSError as e:
+                print(f"⚠️ Could not save the Canvas fixture archive: {e}")
+        if own_client:
+            client.close()
+
+    snapshot = Snapshot(data, taken_at)
+    if store:
+        snapshot.run_id = store.save(data, taken_at)
+        store.prune(SNAPSHOT_HISTORY_RUNS)
+        log(f"🗄️ Snapshot saved as run {snapshot.run_id}")
+    return snapshot
+
+def load(store, run_id="latest"):
+    """Load a stored run ("latest" or a run id) as a Snapshot taken at the time of that run,
+    so it renders exactly like the original run without contacting Canvas"""
+    if run_id == "latest":
+        run_id = store.latest_run_id()
+    taken_at = store.run_created_at(run_id)
+    if taken_at is None:
+        raise ValueError(f"Snapshot run '{run_id}' not found in the snapshot store")
+    return Snapshot(store.load(run_id), taken_at, run_id)
+
+def classify(snapshot, due_date_before=FILTER_DUE_DATE_BEFORE):
+    """Index and classify every assignment once, returns a new Snapshot carrying the
+    due_indexes and classifications every renderer shares.
+
+    Assignments due before due_date_before are dropped first, the given snapshot (and
+    the stored one) keeps them.
+    """
+    data = snapshot.data
+    due_indexes = build_due_date_indexes(data)
+    if due_date_before:
+        data, due_indexes = apply_due_date_filter(data, due_indexes, due_date_before)
+    classifications = classify_students(data, snapshot.current_time, due_indexes)
+    return replace(snapshot, data=data, due_indexes=due_indexes, classifications=classifications, due_date_before=due_date_before)
+
+RENDER_FORMATS = ("html", "action-items", "email-text", "email-html")
+
+def render(snapshot, fmt="html", student_ids=None, out=None):
+    """Render snapshot, for every student or only student_ids, in one of RENDER_FORMATS:
+    the interactive HTML report, the action items text reports, or the email body.
+
+    Returns the text, or streams it into the text file object out and returns None.
+    """
+    if fmt == "html":
+        if out is not None:
+            write_html_report(out, snapshot, student_ids)
+            return None
+        return "".join(iter_html_report(snapshot, student_ids))
+    if fmt == "action-items":
+        classifications = snapshot_summaries(snapshot)
+        text = "\r\n\r\n".join(
+            generate_action_items_text_report(student_id, student_data, classifications[student_id], snapshot.current_time)
+            for student_id, student_data in selected_students(snapshot.data, student_ids)
+        )
+    elif fmt == "email-text":
+        text = generate_email_body_content(snapshot, student_ids)
+    elif fmt == "email-html":
+        text = generate_email_body_html(snapshot, student_ids)
+    else:
+        raise ValueError(f"Unknown render format: '{fmt}'. Expected one of {', '.join(RENDER_FORMATS)}")
+    if out is not None:
+        out.write(text)
+        return None
+    return text
+
+def write_reports(snapshot, output_dir=""):
+    """Write canvas.html and every student's HTML and action items reports to output_dir
+    ("" is the working directory). Returns (overall report file name or None, individual
+    report file names)."""
+    os.makedirs(output_dir or ".", exist_ok=True)
+    overall_report, student_reports = write_report_files(snapshot, output_dir=output_dir)
+    html_filename = save_html_report(snapshot, overall_report, output_dir)
+    return html_filename, save_individual_student_reports(snapshot, student_reports, output_dir)
+
+def deliver(snapshot, report_files, store=None, mode=EMAIL_MODE, settings=None):
+    """Email the report files (see send_email_report) as configured by settings, an
+    EmailSettings that defaults to the configuration. In "delta" mode only the changes
+    since the run stored before snapshot are sent, or the full report when there is none."""
+    email_delta = None
+    if mode == "delta":
+        email_delta = build_email_delta(snapshot, store)
+        if email_delta is None:
+            print("ℹ️  No previous snapshot to compare against, sending the full report")
+    send_email_report(snapshot, report_files, email_delta, settings)
@@ -0,0 +1,361 @@
+from datetime import datetime, timedelta
+from .config import COURSE_ALIASES, SUMMARY_ENGINE, pacific
+from .model import AssignmentTags, DueDateIndex, build_due_date_indexes
+
+try:
+    import numpy as np
+except ImportError:  # optional, enables the vectorized summary engine
+    np = None
+
+# ─── Assignment Classification ──────────────────────────────────────────────
+
+# Counter each classification state adds to in the per-student and per-course summaries
+STATE_COUNTERS = {
+    "overdue": "overdue_count",
+    "grading-overdue": "grading_overdue_count",
+    "awaiting-grade": "awaiting_grade_count",
+    "upcoming-no-submission": "upcoming_no_submission_count",
+    "missing-score": "missing_scores"
+}
+SUMMARY_COUNTERS = ("total_assignments", *STATE_COUNTERS.values(), "missing_count", "maybe_redo_count", "low_score_count")
+
+def build_tags(assignment, state, is_past_due, is_grading_overdue, is_low_score, due_this_week, is_missing, is_maybe_redo):
+    """Build the AssignmentTags of one assignment from its classification flags"""
+    if assignment.score is not None:
+        status_label = f"Graded ({assignment.grade})"
+    elif assignment.submitted_at:
+        status_label = "Grading Overdue" if is_grading_overdue else "Awaiting Grade"
+    elif assignment.missing:
+        status_label = "Missing"
+    else:
+        status_label = "Not submitted"
+
+    return AssignmentTags(
+        state=state,
+        status_class=" ".join(c for c in (state, "low-score" if is_low_score else None) if c),
+        status_label=status_label,
+        due_class="due-date overdue" if is_past_due and assignment.score is None else "due-date",
+        score_class="score low-score" if is_low_score else "score",
+        due_this_week=due_this_week,
+        is_missing=is_missing,
+        is_maybe_redo=is_maybe_redo,
+        is_low_score=is_low_score
+    )
+
+def classify_assignment(assignment, current_time):
+    """Classify one assignment as of current_time.
+
+    Returns the AssignmentTags every report generator needs: the status state and CSS
+    classes, the status label, and whether it belongs to the missing / maybe redo action items.
+    """
+    due_at = assignment.due_at
+    score = assignment.score
+    submitted_at = assignment.submitted_at
+    points_possible = assignment.points_possible
+    is_past_due = bool(due_at and due_at < current_time)
+
+    is_grading_overdue = bool(submitted_at and (current_time - submitted_at).days >= 3)
+
+    state = None
+    # Overdue: past due date and not submitted
+    if is_past_due:
+        if score is None and not submitted_at:
+            state = "overdue"
+    # Grading overdue: submitted but not graded after 3+ days
+    elif submitted_at and score is None:
+        state = "grading-overdue" if is_grading_overdue else "awaiting-grade"
+    # Upcoming assignment with no submission (purple highlight)
+    elif due_at and due_at > current_time:
+        if score is None and not submitted_at:
+            state = "upcoming-no-submission"
+    # Missing score (only for assignments that are due and not submitted)
+    elif score is None and due_at and due_at < current_time:
+        if not submitted_at:
+            state = "missing-score"
+
+    percentage = None
+    if score is not None and points_possible:
+        try:
+            percentage = (float(score) / float(points_possible)) * 100
+        except (ValueError, ZeroDivisionError):
+            pass
+    is_low_score = percentage is not None and percentage < 80
+
+    # Missing: overdue AND (missing flag OR score is 0 OR no score and not submitted),
+    # only for assignments with valid points_possible
+    is_missing = False
+    if is_past_due and points_possible and float(points_possible) != 0:
+        is_missing = bool(
+            assignment.missing
+            or (score is not None and float(score) == 0)
+            or (score is None and not submitted_at)
+        )
+
+    # Maybe redo: graded less than 66% (exclude 0 or missing scores)
+    is_maybe_redo = False
+    if score is not None and points_possible:
+        try:
+            points_value = float(points_possible)
+            if points_value != 0:
+                score_value = float(score)
+                if score_value > 0 and not assignment.missing:
+                    is_maybe_redo = (score_value / points_value) * 100 < 66
+        except (ValueError, ZeroDivisionError):
+            pass
+
+    due_this_week = bool(due_at and current_time <= due_at <= current_time + timedelta(days=7))
+    return build_tags(assignment, state, is_past_due, is_grading_overdue, is_low_score, due_this_week, is_missing, is_maybe_redo)
+
+def count_tags(counters, tags):
+    """Add one classified assignment to a SUMMARY_COUNTERS dict"""
+    counters["total_assignments"] += 1
+    if tags.state:
+        counters[STATE_COUNTERS[tags.state]] += 1
+    counters["missing_count"] += tags.is_missing
+    counters["maybe_redo_count"] += tags.is_maybe_redo
+    counters["low_score_count"] += tags.is_low_score
+
+def sort_by_due_date_desc(assignments):
+    """Sort assignments most recent due date first, undated ones last"""
+    assignments.sort(key=lambda x: x.due_at if x.due_at else datetime.min.replace(tzinfo=pacific), reverse=True)
+
+def classify_student(student_data, current_time, course_tags=None, counts=None, due_index=None):
+    """Classify all of a student's assignments in one pass.
+
+    Returns the per-student counters (SUMMARY_COUNTERS) and the same counters per course,
+    the per-course assignment tags (aligned with each course's assignment list), the
+    overdue (most recent first) / due-this-week (soonest first) lists read from the
+    student's DueDateIndex, and the missing / maybe redo buckets keyed by course display
+    name, sorted for rendering.
+
+    The NumPy engine passes in the course_tags and counts (student counters,
+    {course_id: counters}) it already computed; by default they are computed here.
+    """
+    summary = {
+        "total_courses": len(student_data['courses']),
+        **dict.fromkeys(SUMMARY_COUNTERS, 0),
+        "course_counts": {},
+        "courses": {},
+        "overdue": [],
+        "due_this_week": [],
+        "upcoming_unsubmitted": [],
+        "missing_by_course": {},
+        "maybe_redo_by_course": {}
+    }
+    if counts:
+        summary.update(counts[0])
+    missing_by_course = {}
+    maybe_redo_by_course = {}
+    course_displays = {}
+
+    for course_id, course_data in student_data['courses'].items():
+        course_display = COURSE_ALIASES.get(course_data["name"], course_data["name"])
+        course_displays[course_id] = course_display
+        if course_tags is None:
+            tags_list = [classify_assignment(assignment, current_time) for assignment in course_data['assignments']]
+        else:
+            tags_list = course_tags[course_id]
+        course_counts = counts[1][course_id] if counts else dict.fromkeys(SUMMARY_COUNTERS, 0)
+
+        for assignment, tags in zip(course_data['assignments'], tags_list):
+            if not counts:
+                count_tags(course_counts, tags)
+            if tags.is_missing:
+                missing_by_course.setdefault(course_display, []).append(assignment)
+            if tags.is_maybe_redo:
+                maybe_redo_by_course.setdefault(course_display, []).append(assignment)
+
+        summary["courses"][course_id] = tags_list
+        summary["course_counts"][course_id] = course_counts
+        if not counts:
+            for counter in SUMMARY_COUNTERS:
+                summary[counter] += course_counts[counter]
+
+    # Date windows come straight from the due date index
+    if due_index is None:
+        due_index = DueDateIndex(student_data)
+    for course_id, assignment in reversed(due_index.overdue(current_time)):
+        if assignment.score is None and not assignment.submitted_at:
+            summary["overdue"].append((course_displays[course_id], assignment))
+    for course_id, assignment in due_index.upcoming(current_time, 7):
+        summary["due_this_week"].append((course_displays[course_id], assignment))
+        if assignment.score is None and not assignment.submitted_at:
+            summary["upcoming_unsubmitted"].append((course_displays[course_id], assignment))
+
+    # Courses alphabetically, assignments most recent first
+    for course_name in sorted(missing_by_course):
+        sort_by_due_date_desc(missing_by_course[course_name])
+        summary["missing_by_course"][course_name] = missing_by_course[course_name]
+    for course_name in sorted(maybe_redo_by_course):
+        sort_by_due_date_desc(maybe_redo_by_course[course_name])
+        summary["maybe_redo_by_course"][course_name] = maybe_redo_by_course[course_name]
+
+    return summary
+
+def classify_students(data, current_time, due_indexes=None):
+    """Classify every student in data, returns {student_id: summary} (see classify_student).
+
+    Uses the NumPy engine unless SUMMARY_ENGINE=python or NumPy is not installed, both
+    engines return identical summaries. due_indexes are built when not given.
+    """
+    if due_indexes is None:
+        due_indexes = build_due_date_indexes(data)
+    if SUMMARY_ENGINE != "python" and np is not None:
+        return classify_students_numpy(data, current_time, due_indexes)
+    return {
+        student_id: classify_student(student_data, current_time, due_index=due_indexes[student_id])
+        for student_id, student_data in data.items()
+    }
+
+
+# ─── NumPy Summary Engine ───────────────────────────────────────────────────
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+# Index of each state in the state column, 0 = no state
+STATE_CODES = (None, *STATE_COUNTERS)
+
+def to_epoch_us(value):
+    """Exact integer microseconds since the epoch of an aware datetime's Pacific wall-clock time.
+
+    Datetimes that share the Pacific tzinfo compare and subtract in wall-clock time, so
+    classify_assignment's "3 days" and "7 days" windows stretch or shrink by an hour
+    across a DST change. The columns use the same clock to give the same answers.
+    """
+    return (value.astimezone(pacific).replace(tzinfo=None) - EPOCH) // MICROSECOND
+
+def to_float(value):
+    """float(value), NaN for None or values that are not numbers"""
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+def build_assignment_table(data):
+    """Flatten every assignment in data into a columnar table of NumPy arrays.
+
+    Rows follow data order (student, course, assignment). Timestamps are exact epoch
+    microseconds of the wall-clock time (see to_epoch_us) next to a has_* mask, scores and points are float64 with NaN for
+    missing values. student_ids and course_keys map the index columns back to data,
+    course_offsets[i]:course_offsets[i + 1] are the rows of course_keys[i].
+    """
+    student_ids = list(data)
+    course_keys = []
+    course_offsets = [0]
+    assignments = []
+    student_index = []
+    for s_i, student_id in enumerate(student_ids):
+        for course_id, course_data in data[student_id]["courses"].items():
+            course_keys.append((student_id, course_id))
+            assignments.extend(course_data["assignments"])
+            student_index.extend([s_i] * len(course_data["assignments"]))
+            course_offsets.append(len(assignments))
+
+    points = [a.points_possible for a in assignments]
+    return {
+        "student_ids": student_ids,
+        "course_keys": course_keys,
+        "course_offsets": course_offsets,
+        "assignments": assignments,
+        "student_index": np.array(student_index, dtype=np.int64),
+        "course_index": np.repeat(np.arange(len(course_keys)), np.diff(course_offsets)),
+        "has_due": np.array([a.due_at is not None for a in assignments], dtype=bool),
+        "due": np.array([to_epoch_us(a.due_at) if a.due_at else 0 for a in assignments], dtype=np.int64),
+        "has_submitted": np.array([a.submitted_at is not None for a in assignments], dtype=bool),
+        "submitted": np.array([to_epoch_us(a.submitted_at) if a.submitted_at else 0 for a in assignments], dtype=np.int64),
+        "has_score": np.array([a.score is not None for a in assignments], dtype=bool),
+        "score": np.array([to_float(a.score) for a in assignments], dtype=np.float64),
+        "points": np.array([to_float(p) for p in points], dtype=np.float64),
+        "has_points": np.array([bool(p) for p in points], dtype=bool),
+        "missing": np.array([bool(a.missing) for a in assignments], dtype=bool)
+    }
+
+def compute_assignment_flags(table, current_time):
+    """Classify every row of an assignment table as of current_time with array operations.
+
+    Mirrors classify_assignment exactly, returns one column per classification flag
+    plus the state column (indexes into STATE_CODES).
+    """
+    now = to_epoch_us(current_time)
+    week_end = now + timedelta(days=7) // MICROSECOND
+    has_score = table["has_score"]
+    has_submitted = table["has_submitted"]
+    score = table["score"]
+    points = table["points"]
+    points_valid = table["has_points"] & (points != 0)
+
+    is_past_due = table["has_due"] & (table["due"] < now)
+    is_future = table["has_due"] & (table["due"] > now)
+    is_grading_overdue = has_submitted & (now - table["submitted"] >= timedelta(days=3) // MICROSECOND)
+    unsubmitted = ~has_score & ~has_submitted
+    awaiting = ~is_past_due & has_submitted & ~has_score
+
+    state = np.zeros(len(score), dtype=np.int8)
+    state[is_past_due & unsubmitted] = STATE_CODES.index("overdue")
+    state[awaiting & is_grading_overdue] = STATE_CODES.index("grading-overdue")
+    state[awaiting & ~is_grading_overdue] = STATE_CODES.index("awaiting-grade")
+    state[~is_past_due & ~awaiting & is_future & unsubmitted] = STATE_CODES.index("upcoming-no-submission")
+    # "missing-score" needs a past due date that is not past due, it never matches (as in classify_assignment)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentage = np.where(has_score & points_valid, score / points * 100, np.nan)
+
+    return {
+        "state": state,
+        "is_past_due": is_past_due,
+        "is_grading_overdue": is_grading_overdue,
+        "is_low_score": percentage < 80,
+        "due_this_week": table["has_due"] & (table["due"] >= now) & (table["due"] <= week_end),
+        "is_missing": is_past_due & points_valid & (table["missing"] | (has_score & (score == 0)) | unsubmitted),
+        "is_maybe_redo": has_score & points_valid & (score > 0) & ~table["missing"] & (percentage < 66)
+    }
+
+def summarize_table(table, flags):
+    """Count SUMMARY_COUNTERS per student and per course with np.bincount.
+
+    Returns (student counters, course counters) as lists of dicts aligned with
+    table["student_ids"] and table["course_keys"].
+    """
+    columns = {"total_assignments": np.ones(len(flags["state"]), dtype=bool)}
+    for code, state in enumerate(STATE_CODES[1:], start=1):
+        columns[STATE_COUNTERS[state]] = flags["state"] == code
+    columns["missing_count"] = flags["is_missing"]
+    columns["maybe_redo_count"] = flags["is_maybe_redo"]
+    columns["low_score_count"] = flags["is_low_score"]
+
+    def tally(index, size):
+        totals = {name: np.bincount(index[mask], minlength=size).tolist() for name, mask in columns.items()}
+        return [{name: totals[name][i] for name in SUMMARY_COUNTERS} for i in range(size)]
+
+    return (
+        tally(table["student_index"], len(table["student_ids"])),
+        tally(table["course_index"], len(table["course_keys"]))
+    )
+
+def classify_students_numpy(data, current_time, due_indexes):
+    """classify_students on the NumPy engine: flags and counters are computed for the
+    whole dataset at once, only the per-row AssignmentTags are built in Python"""
+    table = build_assignment_table(data)
+    flags = compute_assignment_flags(table, current_time)
+    student_counts, course_counts = summarize_table(table, flags)
+
+    states = [STATE_CODES[code] for code in flags["state"].tolist()]
+    rows = zip(
+        table["assignments"], states,
+        *(flags[name].tolist() for name in ("is_past_due", "is_grading_overdue", "is_low_score", "due_this_week", "is_missing", "is_maybe_redo"))
+    )
+    tags = [build_tags(*row) for row in rows]
+
+    course_tags = {student_id: {} for student_id in table["student_ids"]}
+    counts = {student_id: (student_counts[s_i], {}) for s_i, student_id in enumerate(table["student_ids"])}
+    offsets = table["course_offsets"]
+    for c_i, (student_id, course_id) in enumerate(table["course_keys"]):
+        course_tags[student_id][course_id] = tags[offsets[c_i]:offsets[c_i + 1]]
+        counts[student_id][1][course_id] = course_counts[c_i]
+
+    return {
+        student_id: classify_student(data[student_id], current_time, course_tags[student_id], counts[student_id], due_indexes[student_id])
+        for student_id in table["student_ids"]
+    }
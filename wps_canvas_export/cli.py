@@ -0,0 +1,88 @@
+from .api import classify, deliver, fetch, load, write_reports
+from .config import COURSE_ALIASES, EMAIL_ENABLED, LOGGING_ENABLED, RENDER_FROM_SNAPSHOT, log
+from .store import open_snapshot_store
+
+# ─── Slicing Functions ───────────────────────────────────────────────────
+
+def full_overview(student_data, current_time):
+    s = student_data
+    log(f"\n{'='*70}")
+    log(f"📚 Full Overview for {s['name']}")
+    log(f"{'='*70}")
+    for cid, cdata in s["courses"].items():
+        score = cdata["current_score"]
+        final = cdata["final_score"]
+        score_str = f"{score::<6.1f}% / {final:>5.1f}%" if score is not None else "No grade"
+        course_display = COURSE_ALIASES.get(cdata["name"], cdata["name"])
+        log(f"{score_str:<18} {course_display}")
+        for a in sorted(cdata["assignments"], key=lambda x: (x.due_at or current_time)):
+            due_str = a.due_at.strftime("%Y-%m-%d %I:%M %p") if a.due_at else "No due date"
+            log(f"    {a.score} / {a.points_possible} → {due_str} • {a.name} ({a.grade})")
+
+def overdue_overview(student_data, summary):
+    s = student_data
+    log(f"\n⚠️ Overdue / Missing for {s['name']}:")
+    for course_display, a in summary["overdue"]:
+        if a.missing:
+            due_str = a.due_at.strftime("%Y-%m-%d %I:%M %p")
+            log(f"    {due_str} • {course_display} → {a.name} → {a.html_url}")
+
+def upcoming_week(student_data, summary):
+    s = student_data
+    log(f"\n📅 Upcoming Week for {s['name']}:")
+    for course_display, a in summary["due_this_week"]:
+        due_str = a.due_at.strftime("%Y-%m-%d %I:%M %p")
+        log(f"    {due_str} • {course_display} → {a.name}")
+
+# ─── Main ────────────────────────────────────────────────────────────────
+
+def main():
+    """Fetch (or load a stored snapshot), report and email, configured by the environment"""
+    print(f"LOGGING_ENABLED = {LOGGING_ENABLED}")
+    print(f'ℹ️  Starting execution...')
+    snapshot_store = open_snapshot_store(required=bool(RENDER_FROM_SNAPSHOT))
+    try:
+        run(snapshot_store)
+    finally:
+        if snapshot_store:
+            snapshot_store.close()
+
+def run(snapshot_store):
+    if RENDER_FROM_SNAPSHOT:
+        # ─── Load a Stored Snapshot ─────────────────────────────────────────
+        if snapshot_store is None:
+            raise ValueError("RENDER_FROM_SNAPSHOT requires a readable snapshot store in CACHE_DIR")
+        run_id = RENDER_FROM_SNAPSHOT if RENDER_FROM_SNAPSHOT == "latest" else int(RENDER_FROM_SNAPSHOT)
+        print(f'ℹ️  Loading snapshot {RENDER_FROM_SNAPSHOT}...')
+        # Rendered as of the time the snapshot was taken so the report matches the original run
+        snapshot = load(snapshot_store, run_id)
+    else:
+        snapshot = fetch(store=snapshot_store)
+
+    # Index and classify every assignment once, all reports below share the result
+    snapshot = classify(snapshot)
+
+    print(f'ℹ️  Slicing the data...')
+    for sid, student_data in snapshot.data.items():
+        full_overview(student_data, snapshot.current_time)
+        overdue_overview(student_data, snapshot.classifications[sid])
+        upcoming_week(student_data, snapshot.classifications[sid])
+
+    # Generate HTML reports
+    log(f"\n{'='*70}")
+    log("🌐 Generating HTML Reports...")
+    log(f"{'='*70}")
+    if not LOGGING_ENABLED:
+        print("🌐 Generating reports...")
+
+    # Write the overall and individual reports in one pass, each student rendered once
+    html_filename, individual_reports = write_reports(snapshot)
+
+    # Send email if enabled and reports were generated successfully
+    if individual_reports and EMAIL_ENABLED:
+        log(f"\n{'='*70}")
+        log("📧 Sending Email Report...")
+        log(f"{'='*70}")
+        if not LOGGING_ENABLED:
+            print("📧 Sending email...")
+        deliver(snapshot, individual_reports, snapshot_store)
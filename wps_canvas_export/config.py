@@ -0,0 +1,155 @@
+import os
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from zoneinfo import ZoneInfo
+
+# Settings are read from the environment once, when the package is first imported
+
+# ─── Configuration ──────────────────────────────────────────────────────────
+CANVAS_API_URL   = os.environ.get("CANVAS_API_URL", "")
+CANVAS_API_KEY  = os.environ.get("CANVAS_API_KEY", "")
+GMAIL_USER = os.environ.get("GMAIL_USER", "")
+GMAIL_APP_PASSWORD = os.environ.get("GMAIL_APP_PASSWORD", "")
+# EMAIL_RECIPIENTS: comma-separated list of email addresses (defaults to GMAIL_USER if not set)
+EMAIL_RECIPIENTS = os.environ.get("EMAIL_RECIPIENTS", "")
+# EMAIL_RECIPIENT_STUDENTS: optional semicolon-separated recipient=students mapping so a recipient only gets
+# their students, e.g. "mom@example.com=Alice Smith,Bob Smith; grandpa@example.com=Cara O'Neil".
+# Recipients that are not mapped get every student
+EMAIL_RECIPIENT_STUDENTS = os.environ.get("EMAIL_RECIPIENT_STUDENTS", "")
+# FILTER_DUE_DATE_BEFORE: optional ISO date string (e.g., 2026-01-01) to exclude assignments due before this date
+FILTER_DUE_DATE_BEFORE_STR = os.environ.get("FILTER_DUE_DATE_BEFORE", "")
+FILTER_DUE_DATE_BEFORE = None
+if FILTER_DUE_DATE_BEFORE_STR:
+    try:
+        FILTER_DUE_DATE_BEFORE = datetime.fromisoformat(FILTER_DUE_DATE_BEFORE_STR).replace(tzinfo=timezone.utc)
+    except ValueError:
+        print(f"⚠️ Invalid FILTER_DUE_DATE_BEFORE value: '{FILTER_DUE_DATE_BEFORE_STR}'. Expected ISO format (e.g., 2026-01-01). Ignoring filter.")
+
+
+def env_int(name, default, minimum=0):
+    """Read an integer environment variable, falling back to default when unset or invalid"""
+    value = os.environ.get(name, "")
+    if not value:
+        return default
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        print(f"⚠️ Invalid {name} value: '{value}'. Expected an integer. Using {default}.")
+        return default
+
+# FETCH_CONCURRENCY: maximum number of Canvas requests in flight at once (1 = fully serial)
+FETCH_CONCURRENCY = env_int("FETCH_CONCURRENCY", 8, minimum=1)
+# FETCH_BACKEND: "rest" walks the REST API per student and course, "graphql" batches everything into a few GraphQL queries
+FETCH_BACKEND = os.environ.get("FETCH_BACKEND", "rest").lower()
+if FETCH_BACKEND not in ("rest", "graphql"):
+    print(f"⚠️ Invalid FETCH_BACKEND value: '{FETCH_BACKEND}'. Expected rest or graphql. Using rest.")
+    FETCH_BACKEND = "rest"
+# FETCH_RETRIES: times a GET is retried after Canvas throttles it, a 5xx response or a connection error
+FETCH_RETRIES = env_int("FETCH_RETRIES", 4)
+# CANVAS_RECORD: fixture archive to record every Canvas response of the run into (e.g. fixtures/run.jsonl.gz)
+CANVAS_RECORD = os.environ.get("CANVAS_RECORD", "")
+# CANVAS_REPLAY: fixture archive to serve the Canvas responses from instead of Canvas (no credentials needed)
+CANVAS_REPLAY = os.environ.get("CANVAS_REPLAY", "")
+# CANVAS_REPLAY_LATENCY_MS: delay added to every replayed response to stand in for the network
+CANVAS_REPLAY_LATENCY_MS = env_int("CANVAS_REPLAY_LATENCY_MS", 0)
+# FETCH_PREFETCH_PAGES: pages of submissions requested ahead of the one being processed (0 = no read-ahead)
+FETCH_PREFETCH_PAGES = env_int("FETCH_PREFETCH_PAGES", 1)
+# HTTP_POOL_SIZE: keep-alive connections kept open to Canvas (defaults to FETCH_CONCURRENCY, one per worker)
+HTTP_POOL_SIZE = env_int("HTTP_POOL_SIZE", FETCH_CONCURRENCY, minimum=1)
+# RENDER_WORKERS: processes rendering the student reports (1 = serial, 0 = one per CPU core)
+RENDER_WORKERS = env_int("RENDER_WORKERS", 1)
+
+# SUMMARY_ENGINE: "auto" (NumPy when installed), "numpy" or "python" for computing the per-student summaries
+SUMMARY_ENGINE = os.environ.get("SUMMARY_ENGINE", "auto").lower()
+if SUMMARY_ENGINE not in ("auto", "numpy", "python"):
+    print(f"⚠️ Invalid SUMMARY_ENGINE value: '{SUMMARY_ENGINE}'. Expected auto, numpy or python. Using auto.")
+    SUMMARY_ENGINE = "auto"
+if SUMMARY_ENGINE == "numpy" and find_spec("numpy") is None:
+    print("⚠️ SUMMARY_ENGINE=numpy but NumPy is not installed. Using the Python engine.")
+    SUMMARY_ENGINE = "python"
+
+# RENDER_FROM_SNAPSHOT: "latest" or a snapshot run id to re-render a stored run without contacting Canvas
+RENDER_FROM_SNAPSHOT = os.environ.get("RENDER_FROM_SNAPSHOT", "")
+
+# ─── Cache Configuration ────────────────────────────────────────────────────
+# CACHE_DIR: directory for local state kept between runs
+CACHE_DIR = os.environ.get("CACHE_DIR", ".canvas_cache")
+HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE_ENABLED", "true").lower() == "true"
+# HTTP_CACHE_TTL: seconds a cached response is served without asking Canvas (0 = always revalidate)
+HTTP_CACHE_TTL = env_int("HTTP_CACHE_TTL", 0)
+# HTTP_CACHE_MAX_MB: size bound of the response cache, least recently used entries are evicted first
+HTTP_CACHE_MAX_MB = env_int("HTTP_CACHE_MAX_MB", 50, minimum=1)
+# INCREMENTAL_SYNC: only request submissions submitted or graded since the previous run
+INCREMENTAL_SYNC = os.environ.get("INCREMENTAL_SYNC", "false").lower() == "true"
+# INCREMENTAL_FULL_SYNC_HOURS: force a full re-fetch of a course after this many hours, which also
+# picks up new assignments and due date changes that the since-filters cannot see
+INCREMENTAL_FULL_SYNC_HOURS = env_int("INCREMENTAL_FULL_SYNC_HOURS", 24)
+# SNAPSHOT_STORE_ENABLED: keep every run's students_data in CACHE_DIR/snapshots.sqlite
+SNAPSHOT_STORE_ENABLED = os.environ.get("SNAPSHOT_STORE_ENABLED", "true").lower() == "true"
+# SNAPSHOT_HISTORY_RUNS: number of past runs kept in the snapshot store, at least 2 so EMAIL_MODE=delta
+# still finds the previous run after fetch() saved this one and pruned the store
+SNAPSHOT_HISTORY_RUNS = env_int("SNAPSHOT_HISTORY_RUNS", 30, minimum=2)
+# SKIP_UNCHANGED_REPORTS: only re-render the reports of students whose data changed since the last run
+SKIP_UNCHANGED_REPORTS = os.environ.get("SKIP_UNCHANGED_REPORTS", "false").lower() == "true"
+
+# ─── Email Configuration ────────────────────────────────────────────────────
+EMAIL_ENABLED = os.environ.get("EMAIL_ENABLED", "true").lower() == "true"
+# EMAIL_MODE: "full" sends the whole report every run, "delta" only what changed since the previous snapshot
+EMAIL_MODE = os.environ.get("EMAIL_MODE", "full").lower()
+if EMAIL_MODE not in ("full", "delta"):
+    print(f"⚠️ Invalid EMAIL_MODE value: '{EMAIL_MODE}'. Expected full or delta. Using full.")
+    EMAIL_MODE = "full"
+# ATTACHMENT_MODE: "separate" attaches every report file, "zip" packs them into one deflated
+# archive, "gzip" attaches every HTML report gzip compressed
+ATTACHMENT_MODE = os.environ.get("ATTACHMENT_MODE", "separate").lower()
+if ATTACHMENT_MODE not in ("separate", "zip", "gzip"):
+    print(f"⚠️ Invalid ATTACHMENT_MODE value: '{ATTACHMENT_MODE}'. Expected separate, zip or gzip. Using separate.")
+    ATTACHMENT_MODE = "separate"
+# ATTACHMENT_INLINE_MAX_BYTES: action items text files up to this size are shown inline instead of attached (0 = never)
+ATTACHMENT_INLINE_MAX_BYTES = env_int("ATTACHMENT_INLINE_MAX_BYTES", 0)
+# EMAIL_SEND_RETRIES: times a message is retried after a temporary SMTP failure
+EMAIL_SEND_RETRIES = env_int("EMAIL_SEND_RETRIES", 2)
+# EMAIL_DELIVERY: "smtp" sends through SMTP_HOST, "maildir" / "mbox" write the messages to EMAIL_OUTBOX
+# instead, "local" sends them to an SMTP server started inside the script (nothing leaves the machine)
+EMAIL_DELIVERY = os.environ.get("EMAIL_DELIVERY", "smtp").lower()
+if EMAIL_DELIVERY not in ("smtp", "maildir", "mbox", "local"):
+    print(f"⚠️ Invalid EMAIL_DELIVERY value: '{EMAIL_DELIVERY}'. Expected smtp, maildir, mbox or local. Using smtp.")
+    EMAIL_DELIVERY = "smtp"
+SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = env_int("SMTP_PORT", 587, minimum=1)
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "true").lower() == "true"
+# SMTP_TIMEOUT: seconds to wait for the SMTP server before a connection or message fails
+SMTP_TIMEOUT = env_int("SMTP_TIMEOUT", 60, minimum=1)
+# EMAIL_OUTBOX: Maildir directory or mbox file for EMAIL_DELIVERY=maildir / mbox (defaults to outbox / outbox.mbox)
+EMAIL_OUTBOX = os.environ.get("EMAIL_OUTBOX", "")
+
+# ─── Logging Configuration ──────────────────────────────────────────────────
+# Disable logging in GitHub Actions to prevent personal data from appearing in logs
+LOGGING_ENABLED = os.environ.get("LOGGING_ENABLED", "false").lower() == "true"
+
+def log(*args, **kwargs):
+    """Wrapper for print() that respects LOGGING_ENABLED flag"""
+    if LOGGING_ENABLED:
+        print(*args, **kwargs)
+
+# Time zone the reports are written in, every timestamp is normalized to it at ingest
+pacific = ZoneInfo("America/Los_Angeles")
+
+COURSE_ALIASES = {
+    "AP Precalculus": "AP Precalculus",
+    "Human Centered: Fundamentals of Human Centered Design": "Human Centered Design",
+    "Individuals & Societies 9/10A: Global History Through Graphic Novels: The Modern Age": "I&S 9/10A",
+    "Language & Literature 9/10A: Machines, Aliens, and the Human Condition": "Lang & Lit 9/10A",
+    "Performing Arts: High School Band 1": "High School Band",
+    "Pre-DP Chemistry": "Pre-DP Chemistry",
+    "Spanish 4": "Spanish 4",
+    "Programming: AP Computer Science A": "AP CS A",
+    "Individuals & Societies 8: A Thematic History of the United States": "I&S 8",
+    "Language & Literature 8: Voices of Change: Identity, Belonging, and Power": "Lang & Lit 8",
+    "Integrated High School Mathematics I": "High School Math I",
+    "Physical & Health Education: Musical Choreography": "PE: Musical Choreo",
+    "Science 8: Introduction to High School Sciences": "Science 8",
+    "Spanish 2": "Spanish 2",
+    "Visual Arts: Photography 1": "Photography 1",
+    "Performing Arts: Acting 1": "Acting 1"
+}
@@ -0,0 +1,475 @@
+import io
+import os
+import re
+import time
+import uuid
+import base64
+import smtplib
+import socket
+import threading
+import socketserver
+from email import policy
+from email.generator import BytesGenerator
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+
+# Email message streaming and delivery backends, used by mail.py and bench-email-delivery.py.
+# Nothing here reads the configuration, callers pass their settings in.
+
+# ─── Message Streaming ──────────────────────────────────────────────────────
+
+# Attachments are read in multiples of 57 bytes, each read encodes to whole 76 character base64 lines
+ATTACHMENT_READ_SIZE = 57 * 1024
+# Bytes of message collected before each write to the SMTP socket
+SEND_BUFFER_SIZE = 256 * 1024
+
+class AttachmentSource:
+    """An attachment that is base64 encoded straight from a file while the message is sent.
+
+    source is a path, or an open binary file object (such as a spooled archive) that is
+    owned by the attachment and closed with it.
+    """
+
+    def __init__(self, filename, source, content_type="application/octet-stream"):
+        self.filename = filename
+        self.source = source
+        self.content_type = content_type
+
+    def size(self):
+        if isinstance(self.source, str):
+            return os.path.getsize(self.source)
+        return os.fstat(self.source.fileno()).st_size
+
+    def encoded_size(self):
+        """Size of the base64 body with its CRLF line breaks"""
+        encoded = 4 * ((self.size() + 2) // 3)
+        return encoded + 2 * ((encoded + 75) // 76)
+
+    def iter_chunks(self):
+        """Yield the part headers and then the base64 body chunk by chunk, CRLF terminated"""
+        headers = MIMEBase(*self.content_type.split("/"), policy=policy.SMTP)
+        headers.add_header('Content-Disposition', 'attachment', filename=self.filename)
+        headers['Content-Transfer-Encoding'] = 'base64'
+        yield b"".join(policy.SMTP.fold_binary(name, value) for name, value in headers.items()) + b"\r\n"
+
+        if isinstance(self.source, str):
+            with open(self.source, "rb") as f:
+                yield from self._encode(f)
+        else:
+            self.source.seek(0)
+            yield from self._encode(self.source)
+
+    @staticmethod
+    def _encode(f):
+        for chunk in iter(lambda: f.read(ATTACHMENT_READ_SIZE), b""):
+            yield base64.encodebytes(chunk).replace(b"\n", b"\r\n")
+
+    def close(self):
+        if not isinstance(self.source, str):
+            self.source.close()
+
+def iter_message_chunks(headers, parts):
+    """Yield a multipart/mixed message as CRLF terminated bytes without ever holding it whole.
+
+    headers are the top level headers (From, To, Subject). MIME parts are flattened with
+    BytesGenerator, AttachmentSources are base64 encoded from disk as they are reached.
+    """
+    boundary = f"==============={uuid.uuid4().hex}=="
+    outer = MIMEMultipart('mixed', boundary=boundary, policy=policy.SMTP)
+    for name, value in headers.items():
+        outer[name] = value
+    yield b"".join(policy.SMTP.fold_binary(name, value) for name, value in outer.items()) + b"\r\n"
+
+    delimiter = f"--{boundary}\r\n".encode()
+    for part in parts:
+        yield delimiter
+        if isinstance(part, AttachmentSource):
+            yield from part.iter_chunks()
+        else:
+            buffer = io.BytesIO()
+            BytesGenerator(buffer, policy=policy.SMTP).flatten(part)
+            yield buffer.getvalue() + b"\r\n"
+    yield f"--{boundary}--\r\n".encode()
+
+def send_streamed_message(server, sender, recipients, chunks):
+    """Send a message given as CRLF terminated byte chunks over an open SMTP connection.
+
+    smtplib's sendmail / send_message need the whole message in memory, so the
+    MAIL / RCPT / DATA exchange is done here and the chunks are dot-stuffed and written
+    to the socket as they are generated. When the server supports PIPELINING the
+    envelope and DATA go out in one write. Returns (bytes sent, refused recipients).
+    """
+    server.ehlo_or_helo_if_needed()
+    if server.has_extn("pipelining"):
+        # RFC 2920: DATA is the last command of the group, the replies come back in order
+        commands = [f"mail FROM:{smtplib.quoteaddr(sender)}"]
+        commands.extend(f"rcpt TO:{smtplib.quoteaddr(recipient)}" for recipient in recipients)
+        commands.append("data")
+        server.send("".join(f"{command}\r\n" for command in commands))
+        replies = [server.getreply() for _ in commands]
+        mail_reply, rcpt_replies, data_reply = replies[0], replies[1:-1], replies[-1]
+    else:
+        mail_reply = server.mail(sender)
+        rcpt_replies = [server.rcpt(recipient) for recipient in recipients] if mail_reply[0] == 250 else []
+        data_reply = None
+
+    if mail_reply[0] != 250:
+        server.rset()
+        raise smtplib.SMTPSenderRefused(*mail_reply, sender)
+    refused = {
+        recipient: reply for recipient, reply in zip(recipients, rcpt_replies)
+        if reply[0] not in (250, 251)
+    }
+    if len(refused) == len(recipients):
+        if data_reply and data_reply[0] == 354:
+            # A server that took the pipelined DATA anyway reads message data until an empty message ends it
+            server.send(b".\r\n")
+            server.getreply()
+        server.rset()
+        raise smtplib.SMTPRecipientsRefused(refused)
+
+    code, response = data_reply or server.docmd("data")
+    if code != 354:
+        server.rset()
+        raise smtplib.SMTPDataError(code, response)
+    # Small chunks (boundaries, part headers) are coalesced so the socket sees few, large writes
+    size = 0
+    pending = []
+    pending_size = 0
+    try:
+        for chunk in chunks:
+            # Every chunk starts at the beginning of a line
+            chunk = re.sub(rb'(?m)^\.', b'..', chunk)
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= SEND_BUFFER_SIZE:
+                server.send(b"".join(pending))
+                size += pending_size
+                pending, pending_size = [], 0
+        pending.append(b".\r\n")
+        server.send(b"".join(pending))
+        size += pending_size
+        code, response = server.getreply()
+    except BaseException:
+        # The server is still reading message data, anything sent next would end up in this message
+        server.close()
+        raise
+    if code != 250:
+        raise smtplib.SMTPDataError(code, response)
+    return size, refused
+
+# ─── Delivery Backends ──────────────────────────────────────────────────────
+# Every backend has connect(), send(recipients, message_chunks) -> (bytes, refused recipients)
+# and close(). message_chunks() returns a fresh iterator over the message for every attempt.
+
+def no_log(*args, **kwargs):
+    pass
+
+class SMTPDelivery:
+    """One SMTP connection that every message of a run is sent over.
+
+    A message that fails with a temporary (4xx) error is retried on the same
+    connection after RSET, so STARTTLS and login are only redone when the server
+    dropped the connection. Login is skipped when the server offers no AUTH.
+    """
+
+    def __init__(self, sender, password="", host="smtp.gmail.com", port=587, starttls=True, retries=2, log=no_log,
+                 timeout=60):
+        self.sender = sender
+        self.password = password
+        self.host = host
+        self.port = port
+        self.starttls = starttls
+        self.retries = retries
+        self.timeout = timeout
+        self.log = log
+        self.server = None
+
+    @property
+    def name(self):
+        return f"SMTP {self.host}:{self.port}"
+
+    def connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            # Writes are already coalesced (see send_streamed_message), Nagle would only hold back the last one
+            server.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.starttls:
+                server.starttls()  # Enable encryption
+            server.ehlo_or_helo_if_needed()
+            if server.has_extn("auth"):
+                server.login(self.sender, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+
+    def send(self, recipients, message_chunks):
+        for attempt in range(self.retries + 1):
+            try:
+                if self.server is None:
+                    self.connect()
+                return send_streamed_message(self.server, self.sender, recipients, message_chunks())
+            except smtplib.SMTPServerDisconnected:
+                self.server = None
+                if attempt == self.retries:
+                    raise
+            except smtplib.SMTPResponseException as e:
+                if not 400 <= e.smtp_code < 500 or attempt == self.retries:
+                    raise
+                self.reset()
+            except smtplib.SMTPRecipientsRefused:
+                # Only this message fails, send_streamed_message reset the session for the next one
+                raise
+            except BaseException as e:
+                # A transport error, or a message that failed mid-DATA (e.g. an attachment could not
+                # be read) and whose socket send_streamed_message closed: the next send reconnects
+                if self.server is not None and (isinstance(e, OSError) or self.server.sock is None):
+                    self.server.close()
+                    self.server = None
+                raise
+            self.log(f"🔁 Retrying message to {', '.join(recipients)} ({attempt + 1}/{self.retries})")
+            time.sleep(2 ** attempt)
+
+    def reset(self):
+        if self.server is None:
+            return
+        try:
+            self.server.rset()
+        except smtplib.SMTPServerDisconnected:
+            self.server = None
+
+    def close(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except smtplib.SMTPException:
+            self.server.close()
+        self.server = None
+
+class LocalSMTPDelivery(SMTPDelivery):
+    """SMTPDelivery to a LocalSMTPServer started in this process, nothing leaves the machine"""
+
+    def __init__(self, sender, keep_messages=False, reply_delay=0.0, **kwargs):
+        self.local_server = LocalSMTPServer(keep_messages=keep_messages, reply_delay=reply_delay)
+        super().__init__(sender, starttls=False, **kwargs)
+
+    @property
+    def name(self):
+        return "in-process SMTP server"
+
+    def connect(self):
+        if self.local_server.port is None:
+            self.host, self.port = self.local_server.start()
+        super().connect()
+
+    def close(self):
+        super().close()
+        self.local_server.stop()
+
+class MaildirDelivery:
+    """Writes every message as a file into a Maildir (new/), e.g. to inspect or load test the output"""
+
+    def __init__(self, path, sender):
+        self.path = path
+        self.sender = sender
+        self.count = 0
+
+    @property
+    def name(self):
+        return f"Maildir {self.path}"
+
+    def connect(self):
+        for subdirectory in ("tmp", "new", "cur"):
+            os.makedirs(os.path.join(self.path, subdirectory), exist_ok=True)
+
+    def send(self, recipients, message_chunks):
+        # Written to tmp/ and renamed into new/, so readers never see a partial message
+        self.count += 1
+        unique = f"{time.time():.6f}.{os.getpid()}_{self.count}.{socket.gethostname()}"
+        tmp_path = os.path.join(self.path, "tmp", unique)
+        size = 0
+        with open(tmp_path, "wb") as f:
+            f.write(f"Return-Path: <{self.sender}>\nX-Envelope-To: {', '.join(recipients)}\n".encode())
+            for chunk in message_chunks():
+                chunk = chunk.replace(b"\r\n", b"\n")
+                f.write(chunk)
+                size += len(chunk)
+        os.rename(tmp_path, os.path.join(self.path, "new", unique))
+        return size, {}
+
+    def close(self):
+        pass
+
+class MboxDelivery:
+    """Appends every message to an mbox file (mboxrd quoting of From_ lines)"""
+
+    def __init__(self, path, sender):
+        self.path = path
+        self.sender = sender
+        self.file = None
+
+    @property
+    def name(self):
+        return f"mbox {self.path}"
+
+    def connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, "ab")
+
+    def send(self, recipients, message_chunks):
+        if self.file is None:
+            self.connect()
+        size = 0
+        self.file.write(f"From {self.sender or 'MAILER-DAEMON'} {time.asctime(time.gmtime())}\n".encode())
+        for chunk in message_chunks():
+            # Every chunk starts at the beginning of a line
+            chunk = re.sub(rb'(?m)^(>*From )', rb'>\1', chunk.replace(b"\r\n", b"\n"))
+            self.file.write(chunk)
+            size += len(chunk)
+        self.file.write(b"\n")
+        self.file.flush()
+        return size, {}
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def open_delivery(kind, sender, password="", host="smtp.gmail.com", port=587, starttls=True, path="", retries=2, log=no_log,
+                  timeout=60):
+    """Delivery backend for kind: "smtp", "local" (in-process SMTP server), "maildir" or "mbox" """
+    if kind == "smtp":
+        return SMTPDelivery(sender, password, host, port, starttls, retries, log, timeout)
+    if kind == "local":
+        return LocalSMTPDelivery(sender, retries=retries, log=log, timeout=timeout)
+    if kind == "maildir":
+        return MaildirDelivery(path or "outbox", sender)
+    if kind == "mbox":
+        return MboxDelivery(path or "outbox.mbox", sender)
+    raise ValueError(f"Unknown delivery backend: {kind}")
+
+# ─── Local SMTP Server ──────────────────────────────────────────────────────
+
+class LocalSMTPHandler(socketserver.StreamRequestHandler):
+    """Enough of RFC 5321 for smtplib and send_streamed_message: EHLO with PIPELINING, no TLS or AUTH"""
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        self.reply("220 localhost ESMTP ready")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].split(":", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-localhost")
+                self.reply("250-PIPELINING")
+                self.reply("250-8BITMIME")
+                self.reply("250 SIZE 0")
+            elif verb == "HELO":
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                sender, recipients = command.partition(":")[2].strip(), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                if sender is None:
+                    self.reply("503 Need MAIL first")
+                else:
+                    recipients.append(command.partition(":")[2].strip())
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                if not recipients:
+                    self.reply("554 No valid recipients")
+                    continue
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size, message = 0, [] if server.keep_messages else None
+                for data_line in iter(self.rfile.readline, b""):
+                    if data_line == b".\r\n":
+                        break
+                    if data_line.startswith(b".."):
+                        data_line = data_line[1:]
+                    size += len(data_line)
+                    if message is not None:
+                        message.append(data_line)
+                else:
+                    # Connection closed before the terminating ".", the message is incomplete
+                    return
+                if server.reply_delay:
+                    time.sleep(server.reply_delay)
+                server.received(sender, recipients, size, message)
+                sender, recipients = None, []
+                self.reply("250 OK queued")
+            elif verb == "RSET":
+                sender, recipients = None, []
+                self.reply("250 OK")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+class LocalSMTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """In-process SMTP sink on localhost for load testing delivery without touching Gmail.
+
+    Counts the messages and bytes it receives, keeps the messages themselves when
+    keep_messages is set, and waits reply_delay seconds before acknowledging each
+    message to stand in for a remote server's processing time.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, keep_messages=False, reply_delay=0.0):
+        super().__init__((host, port), LocalSMTPHandler, bind_and_activate=False)
+        self.keep_messages = keep_messages
+        self.reply_delay = reply_delay
+        self.messages = []
+        self.message_count = 0
+        self.byte_count = 0
+        self.port = None
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        """Start serving in a background thread, returns (host, port)"""
+        self.server_bind()
+        self.server_activate()
+        self.port = self.server_address[1]
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self.server_address
+
+    def stop(self):
+        if self.thread is not None:
+            self.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.server_close()
+
+    def received(self, sender, recipients, size, message):
+        with self.lock:
+            self.message_count += 1
+            self.byte_count += size
+            if message is not None:
+                self.messages.append({"from": sender, "to": recipients, "data": b"".join(message)})
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
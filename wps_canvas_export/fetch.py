@@ -0,0 +1,287 @@
+import os
+import json
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+from .config import CACHE_DIR, FETCH_CONCURRENCY, FETCH_PREFETCH_PAGES, INCREMENTAL_FULL_SYNC_HOURS, log
+from .model import Assignment, assignment_from_json, assignment_to_json, parse_canvas_datetime
+from .transport import canvas_requester_attribute
+
+# ─── Canvas Fetch Functions ─────────────────────────────────────────────────
+
+# Largest page Canvas serves, every list below is walked in as few requests as possible
+CANVAS_PER_PAGE = 100
+
+def course_url(canvas, course_id):
+    """Web address of a course on the Canvas instance canvas talks to ("#" when unknown)"""
+    base_url = canvas_requester_attribute(canvas, "original_url")
+    return f"{base_url}/courses/{course_id}" if base_url else "#"
+
+def read_ahead(items, depth=FETCH_PREFETCH_PAGES, page_size=CANVAS_PER_PAGE):
+    """Iterate a canvasapi PaginatedList while a background thread walks its pages ahead.
+
+    The thread follows the Link headers and buffers up to depth pages, so the request
+    for the next page is already in flight while the items of this one are processed.
+    An exception of the walk is raised here once the items before it are consumed.
+    depth 0 iterates in the calling thread.
+    """
+    if depth <= 0:
+        yield from items
+        return
+
+    buffer = queue.Queue(maxsize=depth * page_size)
+    stopped = threading.Event()
+
+    def put(entry):
+        # Gives up once the consumer stopped early, instead of blocking on a full buffer forever
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def walk():
+        try:
+            for item in items:
+                if not put((True, item)):
+                    return
+        except Exception as e:
+            put((False, e))
+            return
+        put((False, None))
+
+    threading.Thread(target=walk, daemon=True).start()
+    try:
+        while True:
+            is_item, value = buffer.get()
+            if is_item:
+                yield value
+            elif value is None:
+                return
+            else:
+                raise value
+    finally:
+        stopped.set()
+
+class CourseResolver:
+    """Resolves course ids to Canvas courses, shared by every observee in a run.
+
+    Each observee's active course list is bulk-loaded with one paginated request and
+    memoized, so siblings enrolled in the same class share a single Course object.
+    Ids that were not primed fall back to canvas.get_course, and concurrent lookups
+    of the same id wait on the first request instead of issuing their own.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._courses = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def prime(self, student):
+        """Bulk-load all active courses for an observee"""
+        try:
+            courses = list(student.get_courses(enrollment_state="active", per_page=CANVAS_PER_PAGE))
+        except Exception as e:
+            log(f"⚠️ Could not list courses for {student.name}, falling back to single lookups: {e}")
+            return
+        with self._lock:
+            for course in courses:
+                self._courses.setdefault(course.id, course)
+
+    def get(self, course_id):
+        """Return the course for course_id, fetching it only if nothing has loaded it yet"""
+        with self._lock:
+            course = self._courses.get(course_id)
+            if course is not None:
+                return course
+            pending = self._pending.get(course_id)
+            if pending is None:
+                pending = self._pending[course_id] = Future()
+                is_owner = True
+            else:
+                is_owner = False
+
+        if not is_owner:
+            return pending.result()
+
+        try:
+            course = self.canvas.get_course(course_id)
+        except Exception as e:
+            with self._lock:
+                del self._pending[course_id]
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._courses[course_id] = course
+            del self._pending[course_id]
+        pending.set_result(course)
+        return course
+
+def fetch_enrollments(student):
+    """Fetch the active student enrollments for one observee"""
+    print(f"ℹ️  Getting student's data...")
+    return list(student.get_enrollments(
+        type=["StudentEnrollment"],
+        state=["active"],
+        per_page=CANVAS_PER_PAGE
+    ))
+
+def build_assignment(sub):
+    """Convert a submission (with its assignment included) into an Assignment record"""
+    a = sub.assignment
+    return Assignment(
+        id=a.get("id"),
+        name=a.get("name"),
+        due_at=parse_canvas_datetime(a.get("due_at")),
+        points_possible=a.get("points_possible"),
+        score=getattr(sub, "score", None),
+        grade=getattr(sub, "grade", None),
+        missing=getattr(sub, "missing", None),
+        submitted_at=parse_canvas_datetime(getattr(sub, "submitted_at", None)),
+        graded_at=parse_canvas_datetime(getattr(sub, "graded_at", None)),
+        unlock_at=parse_canvas_datetime(a.get("unlock_at")),
+        lock_at=parse_canvas_datetime(a.get("lock_at")),
+        html_url=a.get("html_url")
+    )
+
+def fetch_course_data(student, enr, course_resolver, previous_sync=None):
+    """Fetch one enrolled course and its submissions.
+
+    When previous_sync holds this course's last sync entry, only submissions submitted or
+    graded since then are requested and merged over the stored records. Returns
+    (course_id, course_data, sync_entry) or None when the course cannot be loaded.
+    """
+    try:
+        course = course_resolver.get(enr.course_id)
+    except Exception as e:
+        print(f"⚠️ Course {enr.course_id} could not be loaded and is missing from the report: {e}")
+        return None
+
+    started_at = datetime.now(timezone.utc)
+    g = enr.grades
+    course_data = {
+        "name": course.name,
+        "current_score": g.get("current_score"),
+        "final_score": g.get("final_score"),
+        "assignments": [],
+        "html_url": getattr(course, "html_url", None) or course_url(course_resolver.canvas, course.id)
+    }
+
+    if previous_sync and started_at - datetime.fromisoformat(previous_sync["full_synced_at"]) < timedelta(hours=INCREMENTAL_FULL_SYNC_HOURS):
+        assignments = {a.id: a for a in map(assignment_from_json, previous_sync["assignments"])}
+        # Overlap the window slightly so clock skew between us and Canvas cannot drop a change
+        since = datetime.fromisoformat(previous_sync["synced_at"]) - timedelta(minutes=5)
+        for since_filter in ("submitted_since", "graded_since"):
+            for sub in read_ahead(course.get_multiple_submissions(
+                student_ids=[student.id],
+                include=["assignment"],
+                per_page=CANVAS_PER_PAGE,
+                **{since_filter: since}
+            )):
+                assignment = build_assignment(sub)
+                assignments[assignment.id] = assignment
+        full_synced_at = previous_sync["full_synced_at"]
+    else:
+        # Fetch all submissions (includes assignment info)
+        assignments = {}
+        for sub in read_ahead(course.get_multiple_submissions(
+            student_ids=[student.id],
+            include=["assignment"],
+            per_page=CANVAS_PER_PAGE
+        )):
+            assignment = build_assignment(sub)
+            assignments[assignment.id] = assignment
+        full_synced_at = started_at.isoformat()
+
+    # FILTER_DUE_DATE_BEFORE is applied on the due date index after ingest, see apply_due_date_filter
+    course_data["assignments"].extend(assignments.values())
+
+    sync_entry = {
+        "synced_at": started_at.isoformat(),
+        "full_synced_at": full_synced_at,
+        "assignments": [assignment_to_json(a) for a in assignments.values()]
+    }
+    return course.id, course_data, sync_entry
+
+def fetch_students_data(canvas, observees, sync_state=None):
+    """Fetch courses and submissions for all observees using a bounded pool of workers.
+
+    Enrollment lookups run per student and each enrolled course (course lookup plus its
+    submission pages) runs as its own job, so the total time is bounded by the slowest
+    chains spread across FETCH_CONCURRENCY workers rather than the sum of every request.
+    Students and courses keep their Canvas ordering in the returned dict.
+
+    When sync_state is given (see load_sync_state) courses are synced incrementally
+    against it, and it is updated in place with the entries of this run.
+    """
+    previous_courses = sync_state["courses"] if sync_state is not None else {}
+    synced_courses = {}
+    students = list(observees)
+    course_resolver = CourseResolver(canvas)
+    data = {}
+
+    with ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY) as pool:
+        enrollment_jobs = [pool.submit(fetch_enrollments, student) for student in students]
+        prime_jobs = [pool.submit(course_resolver.prime, student) for student in students]
+
+        # Queue course jobs as soon as each student's enrollments and course list arrive
+        course_jobs = []
+        for student, enrollment_job, prime_job in zip(students, enrollment_jobs, prime_jobs):
+            enrollments = enrollment_job.result()
+            prime_job.result()
+            course_jobs.append([
+                pool.submit(fetch_course_data, student, enr, course_resolver, previous_courses.get(f"{student.id}:{enr.course_id}"))
+                for enr in enrollments
+            ])
+
+        for student, jobs in zip(students, course_jobs):
+            courses = {}
+            for job in jobs:
+                result = job.result()
+                if result is None:
+                    continue
+                course_id, course_data, sync_entry = result
+                courses[course_id] = course_data
+                synced_courses[f"{student.id}:{course_id}"] = sync_entry
+
+            data[student.id] = {
+                "name": student.name,
+                "courses": courses
+            }
+
+    if sync_state is not None:
+        # Courses the students are no longer enrolled in drop out of the state
+        sync_state["courses"] = synced_courses
+    return data
+
+# ─── Incremental Sync State ─────────────────────────────────────────────────
+
+def sync_state_path():
+    return os.path.join(CACHE_DIR, "sync_state.json")
+
+def load_sync_state():
+    """Load the per-course sync state of the previous run (empty when there is none)"""
+    try:
+        with open(sync_state_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"courses": {}}
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read sync state, doing a full sync: {e}")
+        return {"courses": {}}
+
+def save_sync_state(sync_state):
+    """Write the sync state atomically so an interrupted run never leaves a partial file"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = sync_state_path() + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(sync_state, f)
+        os.replace(tmp_path, sync_state_path())
+    except OSError as e:
+        print(f"⚠️ Could not save sync state: {e}")
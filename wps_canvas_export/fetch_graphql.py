@@ -0,0 +1,166 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from canvasapi.exceptions import CanvasException
+from .config import FETCH_CONCURRENCY
+from .fetch import CANVAS_PER_PAGE, course_url
+from .model import Assignment, assignment_to_json, parse_canvas_datetime
+
+# ─── GraphQL Fetch Backend ──────────────────────────────────────────────────
+
+# Aliased lookups per query, Canvas rejects queries above its complexity limit
+GRAPHQL_BATCH_SIZE = 20
+
+ENROLLMENT_FIELDS = """
+    enrollments {
+        type
+        state
+        grades { currentScore finalScore }
+        course { _id name }
+    }"""
+
+# Canvas leaves unsubmitted submissions out unless asked for, the REST backend gets every state
+SUBMISSION_STATES = "unsubmitted, submitted, pending_review, graded"
+
+SUBMISSION_FIELDS = """
+    nodes {
+        score
+        grade
+        missing
+        submittedAt
+        gradedAt
+        assignment { _id name dueAt pointsPossible unlockAt lockAt htmlUrl }
+    }
+    pageInfo { hasNextPage endCursor }"""
+
+def graphql_query(canvas, query):
+    """POST query to Canvas's /api/graphql and return its data, raising on GraphQL errors
+    (which Canvas reports with a 200 status)"""
+    result = canvas.graphql(query)
+    if result.get("errors"):
+        raise CanvasException(f"GraphQL query failed: {result['errors'][0].get('message')}")
+    return result["data"]
+
+def batched(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def enrollments_query(students):
+    lookups = "\n".join(
+        f'  s{i}: legacyNode(_id: "{student.id}", type: User) {{ ... on User {{{ENROLLMENT_FIELDS} }} }}'
+        for i, student in enumerate(students)
+    )
+    return f"query {{\n{lookups}\n}}"
+
+def submissions_query(pages):
+    """Query for one page of every ((student_id, course_id), cursor) in pages"""
+    lookups = []
+    for i, ((student_id, course_id), cursor) in enumerate(pages):
+        after = f", after: {json.dumps(cursor)}" if cursor else ""
+        lookups.append(
+            f'  c{i}: legacyNode(_id: "{course_id}", type: Course) {{ ... on Course {{'
+            f' submissionsConnection(studentIds: ["{student_id}"], filter: {{states: [{SUBMISSION_STATES}]}},'
+            f' first: {CANVAS_PER_PAGE}{after}) {{{SUBMISSION_FIELDS} }} }} }}'
+        )
+    return "query {\n" + "\n".join(lookups) + "\n}"
+
+def fetch_enrollments_graphql(canvas, pool, students):
+    """{student id: enrollment nodes} of every observee's active student enrollments"""
+    enrollments = {}
+    batches = batched(students, GRAPHQL_BATCH_SIZE)
+    for batch, data in zip(batches, pool.map(lambda batch: graphql_query(canvas, enrollments_query(batch)), batches)):
+        for i, student in enumerate(batch):
+            node = data.get(f"s{i}") or {}
+            enrollments[student.id] = [
+                enrollment for enrollment in node.get("enrollments") or []
+                if enrollment["type"] == "StudentEnrollment" and enrollment["state"] == "active"
+            ]
+    return enrollments
+
+def fetch_submissions_graphql(canvas, pool, pairs):
+    """{(student id, course id): submission nodes} of every pair, all pending pages of
+    every pair fetched together in each round until no connection has a next page"""
+    submissions = {pair: [] for pair in pairs}
+    pending = {pair: None for pair in pairs}
+    while pending:
+        batches = batched(list(pending.items()), GRAPHQL_BATCH_SIZE)
+        for batch, data in zip(batches, pool.map(lambda batch: graphql_query(canvas, submissions_query(batch)), batches)):
+            for i, (pair, _) in enumerate(batch):
+                node = data.get(f"c{i}")
+                if node is None:
+                    raise CanvasException(f"GraphQL returned no course {pair[1]}")
+                connection = node["submissionsConnection"]
+                submissions[pair].extend(connection["nodes"])
+                if connection["pageInfo"]["hasNextPage"]:
+                    pending[pair] = connection["pageInfo"]["endCursor"]
+                else:
+                    del pending[pair]
+    return submissions
+
+def build_graphql_assignment(node):
+    """Convert a submission node (with its assignment) into an Assignment record"""
+    a = node["assignment"]
+    return Assignment(
+        id=int(a["_id"]),
+        name=a["name"],
+        due_at=parse_canvas_datetime(a["dueAt"]),
+        points_possible=a["pointsPossible"],
+        score=node["score"],
+        grade=node["grade"],
+        missing=node["missing"],
+        submitted_at=parse_canvas_datetime(node["submittedAt"]),
+        graded_at=parse_canvas_datetime(node["gradedAt"]),
+        unlock_at=parse_canvas_datetime(a["unlockAt"]),
+        lock_at=parse_canvas_datetime(a["lockAt"]),
+        html_url=a["htmlUrl"]
+    )
+
+def fetch_students_data_graphql(canvas, observees, sync_state=None):
+    """Fetch courses and submissions for all observees through Canvas's GraphQL API.
+
+    Returns the same students_data as fetch_students_data from a handful of batched
+    queries: one per GRAPHQL_BATCH_SIZE observees for the enrollments, grades and course
+    names, then one per GRAPHQL_BATCH_SIZE (student, course) pairs and page for the
+    submissions with their assignments. Every course is fetched in full, so when
+    sync_state is given its entries are all written as full syncs.
+    """
+    students = list(observees)
+    started_at = datetime.now(timezone.utc).isoformat()
+    with ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY) as pool:
+        enrollments = fetch_enrollments_graphql(canvas, pool, students)
+        # A student enrolled in several sections of a course has one enrollment per section
+        pairs = list(dict.fromkeys(
+            (student.id, int(enrollment["course"]["_id"])) for student in students for enrollment in enrollments[student.id]
+        ))
+        submissions = fetch_submissions_graphql(canvas, pool, pairs)
+
+    data = {}
+    synced_courses = {}
+    for student in students:
+        courses = {}
+        for enrollment in enrollments[student.id]:
+            course_id = int(enrollment["course"]["_id"])
+            assignments = {}
+            for node in submissions[(student.id, course_id)]:
+                assignment = build_graphql_assignment(node)
+                assignments[assignment.id] = assignment
+            grades = enrollment["grades"] or {}
+            courses[course_id] = {
+                "name": enrollment["course"]["name"],
+                "current_score": grades.get("currentScore"),
+                "final_score": grades.get("finalScore"),
+                "assignments": list(assignments.values()),
+                "html_url": course_url(canvas, course_id)
+            }
+            synced_courses[f"{student.id}:{course_id}"] = {
+                "synced_at": started_at,
+                "full_synced_at": started_at,
+                "assignments": [assignment_to_json(a) for a in assignments.values()]
+            }
+        data[student.id] = {
+            "name": student.name,
+            "courses": courses
+        }
+
+    if sync_state is not None:
+        sync_state["courses"] = synced_courses
+    return data
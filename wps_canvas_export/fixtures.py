@@ -0,0 +1,142 @@
+import io
+import os
+import json
+import gzip
+import time
+import base64
+import hashlib
+import threading
+from datetime import datetime, timezone
+import requests
+from requests.structures import CaseInsensitiveDict
+from .config import log
+
+# ─── Canvas API Fixtures (Record / Replay) ──────────────────────────────────
+
+FIXTURE_FORMAT = "wps-canvas-fixtures"
+FIXTURE_VERSION = 1
+
+# Headers that describe the transfer rather than the (already decoded) body
+SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+def request_key(request):
+    """Identifies a request independent of the Canvas host and token: method, path and query,
+    plus a digest of the body for POSTs (every GraphQL query goes to the same URL)"""
+    key = f"{request.method} {request.path_url}"
+    body = request.body
+    if body:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        key += " " + hashlib.sha256(body).hexdigest()[:16]
+    return key
+
+class FixtureRecorder:
+    """Collects every Canvas response of a run for save() to write as a fixture archive.
+
+    The archive is gzip-compressed JSON lines: a header with the Canvas URL and the
+    time of the recording, then one line per response in the order they arrived.
+    Request headers are never stored, so the token stays out of it, but the responses
+    hold the students' data, keep the archive as private as the reports.
+    """
+
+    def __init__(self, path, canvas_url):
+        self.path = path
+        self.canvas_url = canvas_url
+        self.recorded_at = datetime.now(timezone.utc)
+        self._entries = []
+        self._lock = threading.Lock()
+
+    def record(self, request, response):
+        body = response.content
+        entry = {
+            "key": request_key(request),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in SKIP_HEADERS},
+        }
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        with self._lock:
+            self._entries.append(entry)
+
+    def save(self):
+        """Write the archive atomically, returns the number of responses in it"""
+        with self._lock:
+            entries = list(self._entries)
+        header = {
+            "format": FIXTURE_FORMAT,
+            "version": FIXTURE_VERSION,
+            "canvas_url": self.canvas_url,
+            "recorded_at": self.recorded_at.isoformat(),
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for line in [header] + entries:
+                f.write(json.dumps(line, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self.path)
+        return len(entries)
+
+class FixtureReplay:
+    """Serves the responses of a fixture archive in place of Canvas.
+
+    Requests are matched by request_key. Responses recorded for the same request are
+    served in their recorded order (a throttled or failed attempt, then its retry),
+    the last one again once they run out. latency seconds are slept per request to
+    stand in for the network. A request the archive does not know gets a 404.
+    """
+
+    def __init__(self, path, latency=0.0):
+        self.path = path
+        self.latency = latency
+        self.stats = {"served": 0, "missing": 0}
+        self._responses = {}
+        self._lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != FIXTURE_FORMAT or header.get("version") != FIXTURE_VERSION:
+                raise ValueError(f"{path} is not a version {FIXTURE_VERSION} Canvas fixture archive")
+            for line in f:
+                entry = json.loads(line)
+                self._responses.setdefault(entry["key"], []).append(entry)
+        self.canvas_url = header["canvas_url"]
+        self.recorded_at = datetime.fromisoformat(header["recorded_at"])
+        self._served = {key: 0 for key in self._responses}
+
+    def respond(self, request):
+        if self.latency:
+            time.sleep(self.latency)
+        key = request_key(request)
+        with self._lock:
+            entries = self._responses.get(key)
+            if entries:
+                entry = entries[min(self._served[key], len(entries) - 1)]
+                self._served[key] += 1
+                self.stats["served"] += 1
+            else:
+                entry = None
+                self.stats["missing"] += 1
+
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if entry is None:
+            log(f"⚠️ No recorded response for {key}")
+            response.status_code = 404
+            response.reason = "Not Found"
+            response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+            response._content = json.dumps({"errors": [{"message": f"No recorded response for {key}"}]}).encode()
+        else:
+            response.status_code = entry["status"]
+            response.reason = entry["reason"]
+            response.headers = CaseInsensitiveDict(entry["headers"])
+            response._content = entry["body"].encode("utf-8") if "body" in entry else base64.b64decode(entry["body_b64"])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        # The body is already read, raw only has to support close() for the retry path
+        response._content_consumed = True
+        response.raw = io.BytesIO(response._content)
+        return response
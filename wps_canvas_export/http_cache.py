@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+from .config import CACHE_DIR, HTTP_CACHE_ENABLED, HTTP_CACHE_MAX_MB, HTTP_CACHE_TTL
+from .transport import replace_canvas_session
+
+# ─── HTTP Response Cache ────────────────────────────────────────────────────
+
+class CachingSession(requests.Session):
+    """requests session that keeps GET responses in SQLite and revalidates them.
+
+    Responses younger than ttl seconds are served straight from the cache. Older entries
+    are revalidated with If-None-Match / If-Modified-Since, and a 304 from Canvas returns
+    the cached body, so unchanged pages cost neither bytes nor a full API response.
+    The store is bounded to max_bytes by evicting the least recently used entries.
+    """
+
+    # Headers that describe the transfer rather than the (already decoded) body
+    SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+    def __init__(self, path, ttl=0, max_bytes=50 * 1024 * 1024):
+        super().__init__()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"fresh": 0, "revalidated": 0, "fetched": 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._db.commit()
+        # Running size of the store, so storing a response does not have to sum the whole table
+        self._total_size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        if method.upper() != "GET":
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        headers = dict(headers or {})
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        # Key on the token too so a cache directory is never shared across accounts
+        key = hashlib.sha256(f"{full_url}\n{headers.get('Authorization', '')}".encode()).hexdigest()
+
+        entry = self._load(key)
+        if entry and time.time() - entry["stored_at"] < self.ttl:
+            self._count("fresh")
+            self._touch(key, revalidated=False)
+            return self._cached_response(entry, full_url)
+
+        if entry:
+            if "ETag" in entry["headers"]:
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if "Last-Modified" in entry["headers"]:
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = super().request(method, url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self._count("revalidated")
+            self._touch(key, revalidated=True)
+            return self._cached_response(entry, full_url, response.request)
+
+        self._count("fetched")
+        if response.status_code == 200 and (self.ttl or "ETag" in response.headers or "Last-Modified" in response.headers):
+            self._store(key, full_url, response)
+        return response
+
+    def _count(self, outcome):
+        # The session is shared by the fetch workers
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _load(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"headers": CaseInsensitiveDict(json.loads(row[0])), "body": row[1], "stored_at": row[2]}
+
+    def _touch(self, key, revalidated):
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self._db.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    def _store(self, key, full_url, response):
+        body = response.content
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in self.SKIP_HEADERS}
+        now = time.time()
+        with self._lock:
+            replaced = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, url, headers, body, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, full_url, json.dumps(headers), body, len(body), now, now)
+            )
+            self._total_size += len(body) - (replaced[0] if replaced else 0)
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        if self._total_size <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_size -= size
+            if self._total_size <= self.max_bytes:
+                break
+
+    def _cached_response(self, entry, full_url, request=None):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = full_url
+        response.request = request
+        return response
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self._db.close()
+
+def install_http_cache(canvas):
+    """Put a CachingSession under the Canvas client, returns it (or None when disabled)"""
+    if not HTTP_CACHE_ENABLED:
+        return None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        session = CachingSession(
+            os.path.join(CACHE_DIR, "http_cache.sqlite"),
+            ttl=HTTP_CACHE_TTL,
+            max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024
+        )
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️ HTTP cache unavailable, continuing without it: {e}")
+        return None
+    if not replace_canvas_session(canvas, session):
+        session.close()
+        return None
+    return session
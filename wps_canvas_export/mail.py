@@ -0,0 +1,735 @@
+import os
+import gzip
+import shutil
+import zipfile
+import tempfile
+from dataclasses import dataclass
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.charset import Charset, QP
+from .classification import classify_students
+from .config import (
+    ATTACHMENT_INLINE_MAX_BYTES, ATTACHMENT_MODE, COURSE_ALIASES, EMAIL_DELIVERY, EMAIL_ENABLED, EMAIL_OUTBOX, EMAIL_RECIPIENTS,
+    EMAIL_RECIPIENT_STUDENTS, EMAIL_SEND_RETRIES, GMAIL_APP_PASSWORD, GMAIL_USER,
+    LOGGING_ENABLED, SMTP_HOST, SMTP_PORT, SMTP_STARTTLS, SMTP_TIMEOUT, log, pacific
+)
+from .delivery import AttachmentSource, iter_message_chunks, open_delivery
+from .model import apply_due_date_filter, build_due_date_indexes
+from .rendering import report_file_name, selected_students, snapshot_summaries
+
+# ─── Email Body ─────────────────────────────────────────────────────────────
+
+def generate_email_body_content(snapshot, student_ids=None):
+    """Generate comprehensive text content for email body, for student_ids or every student"""
+    current_time = snapshot.current_time
+    classifications = snapshot_summaries(snapshot)
+    body_content = []
+
+    body_content.append("📚 CANVAS ACADEMIC REPORT")
+    body_content.append("=" * 50)
+    body_content.append(f"Generated: {current_time.strftime('%Y-%m-%d %I:%M %p')}")
+    if snapshot.due_date_before:
+        body_content.append(f"📅 Filtered: Only showing assignments due on or after {snapshot.due_date_before.strftime('%Y-%m-%d')}")
+    body_content.append("")
+
+    # Generate content for each student
+    for student_id, student_data in selected_students(snapshot.data, student_ids):
+        body_content.append(f"👤 {student_data['name'].upper()}")
+        body_content.append("-" * 40)
+
+        # Statistics from the classification pass
+        summary = classifications[student_id]
+        total_courses = summary["total_courses"]
+        total_assignments = summary["total_assignments"]
+        overdue_count = summary["overdue_count"]
+        grading_overdue_count = summary["grading_overdue_count"]
+        awaiting_grade_count = summary["awaiting_grade_count"]
+        upcoming_no_submission_count = summary["upcoming_no_submission_count"]
+
+        # Summary statistics
+        body_content.append(f"📊 SUMMARY:")
+        body_content.append(f"   • Active Courses: {total_courses}")
+        body_content.append(f"   • Total Assignments: {total_assignments}")
+        body_content.append(f"   • Overdue Items: {overdue_count}")
+        body_content.append(f"   • Grading Overdue: {grading_overdue_count}")
+        body_content.append(f"   • Awaiting Grade: {awaiting_grade_count}")
+        body_content.append(f"   • Upcoming (No Submission): {upcoming_no_submission_count}")
+        body_content.append("")
+
+        # Course grades overview
+        body_content.append("📚 COURSE GRADES:")
+        for course_id, course_data in student_data['courses'].items():
+            course_display = COURSE_ALIASES.get(course_data["name"], course_data["name"])
+            current_score = course_data.get("current_score")
+            final_score = course_data.get("final_score")
+
+            current_grade = f"{current_score:.1f}%" if current_score is not None else "No grade"
+            final_grade = f"{final_score:.1f}%" if final_score is not None else "0.0%"
+
+            status_indicator = "⚠️" if current_score is not None and current_score < 80 else "✅"
+            body_content.append(f"   {status_indicator} {course_display}: {current_grade} (Final: {final_grade})")
+
+        body_content.append("")
+
+        # Overdue assignments
+        if overdue_count > 0:
+            body_content.append("⚠️ OVERDUE ASSIGNMENTS:")
+            for course_display, assignment in summary["overdue"]:
+                due_str = assignment.due_at.strftime("%Y-%m-%d %I:%M %p")
+                body_content.append(f"   • {due_str} - {course_display}: {assignment.name}")
+            body_content.append("")
+
+        # Upcoming assignments (next 7 days, nothing submitted yet)
+        upcoming_assignments = []
+        for course_display, assignment in summary["upcoming_unsubmitted"]:
+            due_str = assignment.due_at.strftime("%Y-%m-%d %I:%M %p")
+            upcoming_assignments.append(f"   • {due_str} - {course_display}: {assignment.name}")
+
+        if upcoming_assignments:
+            body_content.append("📅 UPCOMING ASSIGNMENTS (Next 7 Days):")
+            body_content.extend(upcoming_assignments)
+            body_content.append("")
+
+        # Add action items section
+        body_content.append("")
+        body_content.append("🎯 ACTION ITEMS")
+        body_content.append("-" * 40)
+
+        missing_by_course = summary["missing_by_course"]
+        maybe_redo_by_course = summary["maybe_redo_by_course"]
+
+        # Missing assignments
+        if missing_by_course:
+            body_content.append("")
+            total_missing = sum(len(assignments) for assignments in missing_by_course.values())
+            body_content.append(f"🚨 MISSING ASSIGNMENTS: {total_missing}")
+            for course_name, assignments in missing_by_course.items():
+                body_content.append(f"   📚 {course_name} ({len(assignments)})")
+                for assignment in assignments:
+                    due_str = assignment.due_at.strftime("%Y-%m-%d") if assignment.due_at else "No due date"
+                    score_str = f"{assignment.score}" if assignment.score is not None else "—"
+                    points_str = f"{assignment.points_possible}" if assignment.points_possible is not None else "—"
+                    body_content.append(f"      • {due_str} | {score_str}/{points_str} | {assignment.name}")
+
+        # Maybe redo assignments
+        if maybe_redo_by_course:
+            body_content.append("")
+            total_redo = sum(len(assignments) for assignments in maybe_redo_by_course.values())
+            body_content.append(f"⚠️  MAYBE REDO (Scored < 66%): {total_redo}")
+            for course_name, assignments in maybe_redo_by_course.items():
+                body_content.append(f"   📚 {course_name} ({len(assignments)})")
+                for assignment in assignments:
+                    due_str = assignment.due_at.strftime("%Y-%m-%d") if assignment.due_at else "No due date"
+                    percentage = (float(assignment.score) / float(assignment.points_possible)) * 100
+                    body_content.append(f"      • {due_str} | {assignment.score}/{assignment.points_possible} ({percentage:.1f}%) | {assignment.name}")
+
+        if not missing_by_course and not maybe_redo_by_course:
+            body_content.append("")
+            body_content.append("   ✅ No action items - all caught up!")
+
+        body_content.append("")
+        body_content.append("=" * 50)
+        body_content.append("")
+
+    body_content.append("📎 ATTACHMENTS:")
+    body_content.append("For each student, you'll find:")
+    body_content.append("  • HTML report - Open in browser for detailed interactive view")
+    body_content.append("  • Action Items (TXT) - Missing & low-scored assignments for easy copy/paste")
+    body_content.append("")
+    body_content.append("Best regards,")
+    body_content.append("Canvas Integration Bot")
+
+    return "\n".join(body_content)
+
+# Opening of the HTML email bodies, with the dark mode overrides
+EMAIL_HTML_HEAD = """
+    <html>
+    <head>
+    <meta name="color-scheme" content="light dark">
+    <meta name="supported-color-schemes" content="light dark">
+    <style>
+      @media (prefers-color-scheme: dark) {
+        body { background-color: #1a1a1a !important; color: #e0e0e0 !important; }
+        h2 { color: #8fa8ff !important; border-color: #8fa8ff !important; }
+        h3 { color: #ccc !important; }
+        a { color: #8fa8ff !important; }
+        hr { border-color: #444 !important; }
+        .student-section { background-color: #2a2a2a !important; }
+        .stats { background-color: #1a3a4a !important; color: #b8d4e8 !important; }
+        .grades { background-color: #2a2a2a !important; color: #d0d0d0 !important; }
+        .action-items { background-color: #3a3020 !important; color: #e8d8a0 !important; }
+        .filter-notice { background-color: #1a3a4a !important; color: #8ec5e8 !important; }
+        .course-name { color: #b88fd4 !important; }
+        .missing { color: #ff6b7a !important; }
+        .maybe-redo { color: #e8c860 !important; }
+      }
+    </style>
+    </head>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; font-size: 13px; margin: 0; padding: 10px;">
+    """
+
+def generate_email_body_html(snapshot, student_ids=None):
+    """Generate HTML email body with hyperlinked assignment names, for student_ids or every student"""
+    current_time = snapshot.current_time
+    classifications = snapshot_summaries(snapshot)
+
+    html_parts = []
+    html_parts.append(EMAIL_HTML_HEAD)
+
+    html_parts.append(f"<h2 style='color: #667eea; border-bottom: 2px solid #667eea; padding-bottom: 5px; font-size: 18px;'>📚 CANVAS ACADEMIC REPORT</h2>")
+    html_parts.append(f"<p style='font-size: 13px;'><strong>Generated:</strong> {current_time.strftime('%Y-%m-%d %I:%M %p')}</p>")
+    if snapshot.due_date_before:
+        html_parts.append(f"<p class='filter-notice' style='background-color: #e8f4fd; padding: 8px 12px; border-left: 4px solid #74b9ff; font-size: 12px; color: #004085;'>📅 <strong>Filtered:</strong> Only showing assignments due on or after {snapshot.due_date_before.strftime('%Y-%m-%d')}</p>")
+
+    # Generate content for each student
+    for student_id, student_data in selected_students(snapshot.data, student_ids):
+        html_parts.append(f"<div class='student-section' style='margin-bottom: 30px; padding: 15px; background-color: #f9f9f9;'>")
+        html_parts.append(f"<h3 style='color: #555; margin-top: 0; font-size: 15px;'>👤 {student_data['name'].upper()}</h3>")
+
+        # Statistics from the classification pass
+        summary = classifications[student_id]
+        total_courses = summary["total_courses"]
+        total_assignments = summary["total_assignments"]
+        overdue_count = summary["overdue_count"]
+        grading_overdue_count = summary["grading_overdue_count"]
+        awaiting_grade_count = summary["awaiting_grade_count"]
+        upcoming_no_submission_count = summary["upcoming_no_submission_count"]
+
+        # Summary statistics
+        html_parts.append("<div class='stats' style='background-color: #e8f4fd; padding: 10px; margin: 10px 0; font-size: 12px;'>")
+        html_parts.append("<strong>📊 SUMMARY:</strong><br>")
+        html_parts.append(f"• Active Courses: {total_courses}<br>")
+        html_parts.append(f"• Total Assignments: {total_assignments}<br>")
+        html_parts.append(f"• Overdue Items: {overdue_count}<br>")
+        html_parts.append(f"• Grading Overdue: {grading_overdue_count}<br>")
+        html_parts.append(f"• Awaiting Grade: {awaiting_grade_count}<br>")
+        html_parts.append(f"• Upcoming (No Submission): {upcoming_no_submission_count}")
+        html_parts.append("</div>")
+
+        # Course grades
+        html_parts.append("<div class='grades' style='background-color: #f0f0f0; padding: 10px; margin: 10px 0; font-size: 12px;'>")
+        html_parts.append("<strong>📚 COURSE GRADES:</strong><br>")
+        for course_data in student_data['courses'].values():
+            course_display = COURSE_ALIASES.get(course_data["name"], course_data["name"])
+            current_score = course_data.get("current_score")
+            final_score = course_data.get("final_score")
+            current_grade = f"{current_score:.1f}%" if current_score is not None else "No grade"
+            final_grade = f"{final_score:.1f}%" if final_score is not None else "0.0%"
+            status_indicator = "⚠️" if current_score is not None and current_score < 80 else "✅"
+            html_parts.append(f"{status_indicator} {course_display}: {current_grade} (Final: {final_grade})<br>")
+        html_parts.append("</div>")
+
+        # Action items with hyperlinks
+        missing_by_course = summary["missing_by_course"]
+        maybe_redo_by_course = summary["maybe_redo_by_course"]
+
+        if missing_by_course or maybe_redo_by_course:
+            html_parts.append("<div class='action-items' style='background-color: #fff3cd; padding: 10px; margin: 10px 0; font-size: 12px;'>")
+            html_parts.append("<strong>🎯 ACTION ITEMS</strong><br><br>")
+
+            # Missing assignments
+            if missing_by_course:
+                total_missing = sum(len(assignments) for assignments in missing_by_course.values())
+                html_parts.append(f"<span class='missing' style='color: #dc3545;'><strong>🚨 MISSING ASSIGNMENTS: {total_missing}</strong></span><br>")
+                for course_name, assignments in missing_by_course.items():
+                    html_parts.append(f"<div class='course-name' style='font-weight: bold; color: #764ba2; margin-top: 10px; font-size: 13px;'>📚 {course_name} ({len(assignments)})</div>")
+                    for assignment in assignments:
+                        due_str = assignment.due_at.strftime("%Y-%m-%d") if assignment.due_at else "No due date"
+                        score_str = f"{assignment.score}" if assignment.score is not None else "—"
+                        points_str = f"{assignment.points_possible}" if assignment.points_possible is not None else "—"
+                        url = assignment.html_url
+                        html_parts.append(f"<div style='margin-left: 20px; margin-bottom: 5px; font-size: 12px;'>• {due_str} | <a href='{url}' style='color: #667eea; text-decoration: none;' target='_blank'>{assignment.name}</a> | Score: {score_str}/{points_str}</div>")
+                html_parts.append("<br>")
+
+            # Maybe redo assignments
+            if maybe_redo_by_course:
+                total_redo = sum(len(assignments) for assignments in maybe_redo_by_course.values())
+                html_parts.append(f"<span class='maybe-redo' style='color: #856404;'><strong>⚠️ MAYBE REDO (Scored &lt; 66%): {total_redo}</strong></span><br>")
+                for course_name, assignments in maybe_redo_by_course.items():
+                    html_parts.append(f"<div class='course-name' style='font-weight: bold; color: #764ba2; margin-top: 10px; font-size: 13px;'>📚 {course_name} ({len(assignments)})</div>")
+                    for assignment in assignments:
+                        due_str = assignment.due_at.strftime("%Y-%m-%d") if assignment.due_at else "No due date"
+                        percentage = (float(assignment.score) / float(assignment.points_possible)) * 100
+                        url = assignment.html_url
+                        html_parts.append(f"<div style='margin-left: 20px; margin-bottom: 5px; font-size: 12px;'>• {due_str} | <a href='{url}' style='color: #667eea; text-decoration: none;' target='_blank'>{assignment.name}</a> | Score: {assignment.score}/{assignment.points_possible} ({percentage:.1f}%)</div>")
+
+            html_parts.append("</div>")
+        else:
+            html_parts.append("<div class='action-items' style='background-color: #fff3cd; padding: 10px; margin: 10px 0; font-size: 12px;'>")
+            html_parts.append("<strong>✅ No action items - all caught up!</strong>")
+            html_parts.append("</div>")
+
+        html_parts.append("</div>")  # Close student-section
+
+    html_parts.append("<hr>")
+    html_parts.append("<p><strong>📎 ATTACHMENTS:</strong><br>")
+    html_parts.append("For each student, you'll find:<br>")
+    html_parts.append("• HTML report - Open in browser for detailed interactive view<br>")
+    html_parts.append("• Action Items (TXT) - Missing & low-scored assignments for easy copy/paste</p>")
+    html_parts.append("<p>Best regards,<br>Canvas Integration Bot</p>")
+    html_parts.append("</body></html>")
+
+    return "".join(html_parts)
+
+# ─── Delta Digest ───────────────────────────────────────────────────────────
+
+def compute_student_delta(student_data, summary, previous_data, previous_summary):
+    """What changed for one student since the previous run.
+
+    Returns lists of new missing items, newly graded (or regraded) work and new upcoming
+    deadlines as (course_display, assignment), and course grade changes as
+    (course_display, previous score, current score). Assignments are matched by their
+    Canvas id. For a student missing from the previous run every missing item, scored
+    assignment and upcoming deadline counts as new, only grade changes stay empty.
+    """
+    previous_courses = previous_data["courses"] if previous_data else {}
+    previous_assignments = {}
+    previous_missing = set()
+    previous_upcoming = set()
+    if previous_summary:
+        for course_id, course_data in previous_courses.items():
+            for assignment, tags in zip(course_data["assignments"], previous_summary["courses"][course_id]):
+                previous_assignments[assignment.id] = assignment
+                if tags.is_missing:
+                    previous_missing.add(assignment.id)
+        previous_upcoming = {assignment.id for _, assignment in previous_summary["upcoming_unsubmitted"]}
+
+    delta = {"new_missing": [], "newly_graded": [], "grade_changes": [], "new_upcoming": []}
+    for course_id, course_data in student_data["courses"].items():
+        course_display = COURSE_ALIASES.get(course_data["name"], course_data["name"])
+        previous_course = previous_courses.get(course_id)
+        if previous_course and previous_course.get("current_score") != course_data.get("current_score"):
+            delta["grade_changes"].append((course_display, previous_course.get("current_score"), course_data.get("current_score")))
+
+        for assignment, tags in zip(course_data["assignments"], summary["courses"][course_id]):
+            previous = previous_assignments.get(assignment.id)
+            if tags.is_missing and assignment.id not in previous_missing:
+                delta["new_missing"].append((course_display, assignment))
+            if assignment.score is not None and (previous is None or previous.score != assignment.score):
+                delta["newly_graded"].append((course_display, assignment))
+
+    for course_display, assignment in summary["upcoming_unsubmitted"]:
+        if assignment.id not in previous_upcoming:
+            delta["new_upcoming"].append((course_display, assignment))
+    return delta
+
+def build_email_delta(snapshot, store):
+    """Compare snapshot with the run stored in store before it.
+
+    The previous run is filtered by snapshot's due_date_before, so both runs are compared
+    over the same assignments, and classified as of its own time, the way it was reported then. Returns {"since": datetime, "students": {student_id: delta}} (see
+    compute_student_delta), or None when there is no previous snapshot.
+    """
+    if store is None or snapshot.run_id is None:
+        return None
+    previous_run_id = store.latest_run_id(before=snapshot.run_id)
+    if previous_run_id is None:
+        return None
+    previous_time = store.run_created_at(previous_run_id)
+    previous_data = store.load(previous_run_id)
+    previous_indexes = build_due_date_indexes(previous_data)
+    if snapshot.due_date_before:
+        previous_data, previous_indexes = apply_due_date_filter(previous_data, previous_indexes, snapshot.due_date_before)
+    previous_classifications = classify_students(previous_data, previous_time.astimezone(pacific), previous_indexes)
+    classifications = snapshot_summaries(snapshot)
+
+    return {
+        "since": previous_time,
+        "students": {
+            student_id: compute_student_delta(
+                student_data, classifications[student_id],
+                previous_data.get(student_id), previous_classifications.get(student_id)
+            )
+            for student_id, student_data in snapshot.data.items()
+        }
+    }
+
+def changed_students(email_delta, student_ids=None):
+    """Ids of the students (of student_ids, or all) that have anything in their delta"""
+    return [
+        student_id for student_id, delta in email_delta["students"].items()
+        if any(delta.values()) and (student_ids is None or student_id in student_ids)
+    ]
+
+def format_score(score):
+    return f"{score:.1f}%" if score is not None else "No grade"
+
+def generate_delta_email_content(snapshot, email_delta, student_ids=None):
+    """Generate the text body of a delta digest, only students (of student_ids) with changes are listed"""
+    current_time = snapshot.current_time
+    body_content = []
+
+    body_content.append("📚 CANVAS UPDATES")
+    body_content.append("=" * 50)
+    body_content.append(f"Generated: {current_time.strftime('%Y-%m-%d %I:%M %p')}")
+    body_content.append(f"Changes since: {email_delta['since'].astimezone(pacific).strftime('%Y-%m-%d %I:%M %p')}")
+    body_content.append("")
+
+    for student_id in changed_students(email_delta, student_ids):
+        delta = email_delta["students"][student_id]
+        body_content.append(f"👤 {snapshot.data[student_id]['name'].upper()}")
+        body_content.append("-" * 40)
+
+        if delta["new_missing"]:
+            body_content.append(f"🚨 NEW MISSING ASSIGNMENTS: {len(delta['new_missing'])}")
+            for course_display, assignment in delta["new_missing"]:
+                due_str = assignment.due_at.strftime("%Y-%m-%d") if assignment.due_at else "No due date"
+                body_content.append(f"   • {due_str} - {course_display}: {assignment.name}")
+            body_content.append("")
+
+        if delta["newly_graded"]:
+            body_content.append(f"✅ NEWLY GRADED: {len(delta['newly_graded'])}")
+            for course_display, assignment in delta["newly_graded"]:
+                points_str = f"{assignment.points_possible}" if assignment.points_possible is not None else "—"
+                body_content.append(f"   • {course_display}: {assignment.name} ({assignment.score}/{points_str})")
+            body_content.append("")
+
+        if delta["grade_changes"]:
+            body_content.append("📈 COURSE GRADE CHANGES:")
+            for course_display, previous_score, current_score in delta["grade_changes"]:
+                body_content.append(f"   • {course_display}: {format_score(previous_score)} → {format_score(current_score)}")
+            body_content.append("")
+
+        if delta["new_upcoming"]:
+            body_content.append("📅 NEW UPCOMING DEADLINES (Next 7 Days):")
+            for course_display, assignment in delta["new_upcoming"]:
+                due_str = assignment.due_at.strftime("%Y-%m-%d %I:%M %p")
+                body_content.append(f"   • {due_str} - {course_display}: {assignment.name}")
+            body_content.append("")
+
+    body_content.append("Full reports for the students above are attached.")
+    body_content.append("")
+    body_content.append("Best regards,")
+    body_content.append("Canvas Integration Bot")
+
+    return "\n".join(body_content)
+
+def generate_delta_email_html(snapshot, email_delta, student_ids=None):
+    """Generate the HTML body of a delta digest with hyperlinked assignment names"""
+    current_time = snapshot.current_time
+    link_style = "color: #667eea; text-decoration: none;"
+    item_style = "margin-left: 20px; margin-bottom: 5px; font-size: 12px;"
+
+    html_parts = [EMAIL_HTML_HEAD]
+    html_parts.append("<h2 style='color: #667eea; border-bottom: 2px solid #667eea; padding-bottom: 5px; font-size: 18px;'>📚 CANVAS UPDATES</h2>")
+    html_parts.append(f"<p style='font-size: 13px;'><strong>Generated:</strong> {current_time.strftime('%Y-%m-%d %I:%M %p')}<br>")
+    html_parts.append(f"<strong>Changes since:</strong> {email_delta['since'].astimezone(pacific).strftime('%Y-%m-%d %I:%M %p')}</p>")
+
+    for student_id in changed_students(email_delta, student_ids):
+        delta = email_delta["students"][student_id]
+        html_parts.append("<div class='student-section' style='margin-bottom: 30px; padding: 15px; background-color: #f9f9f9;'>")
+        html_parts.append(f"<h3 style='color: #555; margin-top: 0; font-size: 15px;'>👤 {snapshot.data[student_id]['name'].upper()}</h3>")
+
+        if delta["new_missing"]:
+            html_parts.append(f"<span class='missing' style='color: #dc3545;'><strong>🚨 NEW MISSING ASSIGNMENTS: {len(delta['new_missing'])}</strong></span><br>")
+            for course_display, assignment in delta["new_missing"]:
+                due_str = assignment.due_at.strftime("%Y-%m-%d") if assignment.due_at else "No due date"
+                html_parts.append(f"<div style='{item_style}'>• {due_str} | {course_display}: <a href='{assignment.html_url}' style='{link_style}' target='_blank'>{assignment.name}</a></div>")
+
+        if delta["newly_graded"]:
+            html_parts.append(f"<strong>✅ NEWLY GRADED: {len(delta['newly_graded'])}</strong><br>")
+            for course_display, assignment in delta["newly_graded"]:
+                points_str = f"{assignment.points_possible}" if assignment.points_possible is not None else "—"
+                html_parts.append(f"<div style='{item_style}'>• {course_display}: <a href='{assignment.html_url}' style='{link_style}' target='_blank'>{assignment.name}</a> | Score: {assignment.score}/{points_str}</div>")
+
+        if delta["grade_changes"]:
+            html_parts.append("<div class='grades' style='background-color: #f0f0f0; padding: 10px; margin: 10px 0; font-size: 12px;'>")
+            html_parts.append("<strong>📈 COURSE GRADE CHANGES:</strong><br>")
+            for course_display, previous_score, current_score in delta["grade_changes"]:
+                html_parts.append(f"{course_display}: {format_score(previous_score)} → {format_score(current_score)}<br>")
+            html_parts.append("</div>")
+
+        if delta["new_upcoming"]:
+            html_parts.append("<strong>📅 NEW UPCOMING DEADLINES (Next 7 Days):</strong><br>")
+            for course_display, assignment in delta["new_upcoming"]:
+                due_str = assignment.due_at.strftime("%Y-%m-%d %I:%M %p")
+                html_parts.append(f"<div style='{item_style}'>• {due_str} | {course_display}: <a href='{assignment.html_url}' style='{link_style}' target='_blank'>{assignment.name}</a></div>")
+
+        html_parts.append("</div>")  # Close student-section
+
+    html_parts.append("<hr>")
+    html_parts.append("<p>Full reports for the students above are attached.</p>")
+    html_parts.append("<p>Best regards,<br>Canvas Integration Bot</p>")
+    html_parts.append("</body></html>")
+
+    return "".join(html_parts)
+
+# ─── Email Attachments ──────────────────────────────────────────────────────
+
+# Gmail's limit on the size of a whole message, including the base64 encoded attachments
+GMAIL_MAX_MESSAGE_BYTES = 25 * 1024 * 1024
+
+def inline_text_part(filename, text):
+    """Inline text/plain part, quoted-printable so mostly ASCII text stays readable and small"""
+    charset = Charset('utf-8')
+    charset.body_encoding = QP
+    part = MIMEText(text, 'plain', charset)
+    part.add_header('Content-Disposition', 'inline', filename=filename)
+    return part
+
+def zip_attachment_part(filenames, archive_name):
+    """One deflated zip attachment of filenames, streamed from disk into a temporary file.
+    Returns (AttachmentSource or None, names of the files packed)"""
+    packed = []
+    spool = tempfile.TemporaryFile()
+    with zipfile.ZipFile(spool, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename in filenames:
+            try:
+                archive.write(filename, os.path.basename(filename))
+                packed.append(filename)
+            except Exception as e:
+                log(f"❌ Failed to attach {filename}: {e}")
+    if not packed:
+        spool.close()
+        return None, packed
+    return AttachmentSource(archive_name, spool, "application/zip"), packed
+
+def gzip_attachment_part(filename):
+    """filename gzip compressed into a temporary file, attached as .gz"""
+    spool = tempfile.TemporaryFile()
+    try:
+        with open(filename, "rb") as source, gzip.GzipFile(fileobj=spool, mode='wb', mtime=0) as compressed:
+            shutil.copyfileobj(source, compressed)
+    except Exception:
+        spool.close()
+        raise
+    return AttachmentSource(f"{os.path.basename(filename)}.gz", spool, "application/gzip")
+
+def build_attachment_parts(filenames, current_time, settings):
+    """Message parts for the report files according to settings.attachment_mode, inline
+    MIME parts and AttachmentSources (see iter_message_chunks).
+
+    Text reports up to settings.attachment_inline_max_bytes are inlined rather than attached.
+    The rest are attached one by one ("separate"), packed into one zip ("zip"), or
+    attached one by one with every HTML report gzip compressed ("gzip").
+    """
+    parts = []
+    to_attach = []
+    for filename in filenames:
+        try:
+            inline_max_bytes = settings.attachment_inline_max_bytes
+            if inline_max_bytes and filename.endswith(".txt") and os.path.getsize(filename) <= inline_max_bytes:
+                with open(filename, 'r', encoding='utf-8', newline='') as f:
+                    parts.append(inline_text_part(os.path.basename(filename), f.read()))
+                log(f"📎 Inlined: {filename}")
+            else:
+                to_attach.append(filename)
+        except Exception as e:
+            log(f"❌ Failed to attach {filename}: {e}")
+
+    if settings.attachment_mode == "zip" and to_attach:
+        archive_name = f"Canvas_Reports_{current_time.strftime('%Y%m%d')}.zip"
+        part, packed = zip_attachment_part(to_attach, archive_name)
+        if part:
+            parts.append(part)
+            log(f"📎 Attached: {archive_name} ({len(packed)} reports)")
+        return parts
+
+    for filename in to_attach:
+        try:
+            if settings.attachment_mode == "gzip" and filename.endswith(".html"):
+                part = gzip_attachment_part(filename)
+            else:
+                if not os.path.isfile(filename):
+                    raise FileNotFoundError(f"No such file: '{filename}'")
+                part = AttachmentSource(os.path.basename(filename), filename)
+            parts.append(part)
+            log(f"📎 Attached: {filename}")
+        except Exception as e:
+            log(f"❌ Failed to attach {filename}: {e}")
+    return parts
+
+# ─── Email Delivery ─────────────────────────────────────────────────────────
+
+@dataclass
+class EmailSettings:
+    """How send_email_report sends the reports, every field defaults to the environment
+    variable it is named after (see config). recipients and recipient_students take the
+    EMAIL_RECIPIENTS and EMAIL_RECIPIENT_STUDENTS formats."""
+    enabled: bool = EMAIL_ENABLED
+    sender: str = GMAIL_USER
+    password: str = GMAIL_APP_PASSWORD
+    recipients: str = EMAIL_RECIPIENTS
+    recipient_students: str = EMAIL_RECIPIENT_STUDENTS
+    delivery: str = EMAIL_DELIVERY
+    host: str = SMTP_HOST
+    port: int = SMTP_PORT
+    starttls: bool = SMTP_STARTTLS
+    timeout: int = SMTP_TIMEOUT
+    outbox: str = EMAIL_OUTBOX
+    retries: int = EMAIL_SEND_RETRIES
+    attachment_mode: str = ATTACHMENT_MODE
+    attachment_inline_max_bytes: int = ATTACHMENT_INLINE_MAX_BYTES
+
+def parse_recipient_students(value):
+    """{recipient: [student name or id, ...]} from an EMAIL_RECIPIENT_STUDENTS string"""
+    mapping = {}
+    for entry in value.split(";"):
+        if not entry.strip():
+            continue
+        recipient, separator, names = entry.partition("=")
+        if not separator or not recipient.strip():
+            print("⚠️ Invalid EMAIL_RECIPIENT_STUDENTS entry. Expected recipient=Student Name,Student Name. Ignoring it.")
+            continue
+        mapping.setdefault(recipient.strip(), []).extend(name.strip() for name in names.split(",") if name.strip())
+    return mapping
+
+def recipient_groups(data, recipients, recipient_students):
+    """Split the recipients into messages: [(recipients, student ids or None for every student)].
+
+    recipient_students maps a recipient to student names or ids (see parse_recipient_students),
+    recipients getting the same students share one message. A mapped recipient none of whose
+    students is observed is left out with a warning.
+    """
+    students_by_key = {}
+    for student_id, student_data in data.items():
+        students_by_key[str(student_id)] = student_id
+        students_by_key[student_data["name"].lower()] = student_id
+
+    groups = {}
+    for recipient in list(dict.fromkeys(recipients + list(recipient_students))):
+        student_ids = None
+        if recipient in recipient_students:
+            student_ids = set()
+            for name in recipient_students[recipient]:
+                student_id = students_by_key.get(name.lower())
+                if student_id is None:
+                    log(f"⚠️ EMAIL_RECIPIENT_STUDENTS: no observed student '{name}' for {recipient}")
+                else:
+                    student_ids.add(student_id)
+            student_ids = tuple(student_id for student_id in data if student_id in student_ids)
+            if not student_ids:
+                # An empty selection would otherwise render as a report about nobody
+                print("⚠️ EMAIL_RECIPIENT_STUDENTS: a recipient matches no observed student and is skipped")
+                log(f"⚠️ Not emailing {recipient}, none of {', '.join(recipient_students[recipient]) or 'no students'} is observed")
+                continue
+        groups.setdefault(student_ids, []).append(recipient)
+    return [(group_recipients, student_ids) for student_ids, group_recipients in groups.items()]
+
+def student_report_files(data, filenames, student_ids):
+    """The report files among filenames that belong to student_ids"""
+    report_names = set()
+    for student_id in student_ids:
+        clean_name = report_file_name(data[student_id])
+        report_names.update((f"{clean_name}.html", f"{clean_name}_ActionItems.txt"))
+    return [filename for filename in filenames if os.path.basename(filename) in report_names]
+
+def build_email_message(snapshot, recipients, student_ids, report_files, settings, email_delta=None):
+    """Top level headers and parts (see iter_message_chunks) of the email for student_ids (None = everyone)"""
+    current_time = snapshot.current_time
+    headers = {'From': settings.sender, 'To': ', '.join(recipients)}
+    # Generate both plain text and HTML versions
+    if email_delta is not None:
+        headers['Subject'] = f"📚 Canvas Updates - {current_time.strftime('%Y-%m-%d %I:%M %p')}"
+        text_body = generate_delta_email_content(snapshot, email_delta, student_ids)
+        html_body = generate_delta_email_html(snapshot, email_delta, student_ids)
+    else:
+        headers['Subject'] = f"📚 Canvas Academic Report - {current_time.strftime('%Y-%m-%d %I:%M %p')}"
+        text_body = generate_email_body_content(snapshot, student_ids)
+        html_body = generate_email_body_html(snapshot, student_ids)
+
+    # Attach both versions (email clients will prefer HTML if supported)
+    body = MIMEMultipart('alternative')
+    body.attach(MIMEText(text_body, 'plain'))
+    body.attach(MIMEText(html_body, 'html'))
+    parts = [body]
+
+    # Attach individual student reports (see ATTACHMENT_MODE), encoded while sending
+    try:
+        parts.extend(build_attachment_parts(report_files, current_time, settings))
+    except Exception:
+        close_message_parts(parts)
+        raise
+    return headers, parts
+
+def close_message_parts(parts):
+    for part in parts:
+        if isinstance(part, AttachmentSource):
+            part.close()
+
+def send_email_report(snapshot, individual_report_files, email_delta=None, settings=None):
+    """Send email with comprehensive body content and individual student report attachments.
+
+    Recipients mapped to students by EMAIL_RECIPIENT_STUDENTS get a message with only
+    those students, every message goes over one SMTP connection. With email_delta
+    (see build_email_delta) a digest of the changes is sent instead, with only the
+    changed students' reports attached, and nothing is sent when no student changed.
+    settings (an EmailSettings) defaults to the configuration.
+    """
+    settings = settings or EmailSettings()
+    if not settings.enabled:
+        log("📧 Email sending disabled (set EMAIL_ENABLED=true to enable)")
+        return
+
+    if email_delta is not None and not changed_students(email_delta):
+        print("ℹ️  No changes since the previous run, email not sent")
+        return
+
+    if not settings.sender:
+        print("❌ Email configuration missing. Please set GMAIL_USER action secret")
+        return
+    if not settings.password and settings.delivery == "smtp" and settings.host == "smtp.gmail.com":
+        print("❌ Email configuration missing. Please set GMAIL_APP_PASSWORD action secret")
+        return
+
+    # Parse recipients list (comma-separated)
+    recipient_students = parse_recipient_students(settings.recipient_students)
+    recipients_str = settings.recipients if settings.recipients or recipient_students else settings.sender
+    recipients = [email.strip() for email in recipients_str.split(',') if email.strip()]
+
+    if not recipients and not recipient_students:
+        print("❌ No valid email recipients configured")
+        return
+
+    # Connect once (see EMAIL_DELIVERY), every message below is sent over this connection
+    delivery = open_delivery(
+        settings.delivery, settings.sender, settings.password, settings.host, settings.port, settings.starttls,
+        settings.outbox, settings.retries, log, settings.timeout
+    )
+    try:
+        delivery.connect()
+    except Exception as e:
+        print(f"❌ Failed to send email: {str(e)}")
+        log("💡 Make sure you're using a Gmail App Password, not your regular password")
+        log("💡 Enable 2FA and generate an App Password at: https://myaccount.google.com/apppasswords")
+        return
+
+    sent = 0
+    try:
+        for message_recipients, student_ids in recipient_groups(snapshot.data, recipients, recipient_students):
+            if email_delta is not None:
+                student_ids = changed_students(email_delta, student_ids)
+                if not student_ids:
+                    log(f"ℹ️  No changes for {', '.join(message_recipients)}, email not sent")
+                    continue
+            report_files = individual_report_files
+            if student_ids is not None:
+                report_files = student_report_files(snapshot.data, individual_report_files, student_ids)
+
+            parts = []
+            try:
+                headers, parts = build_email_message(snapshot, message_recipients, student_ids, report_files, settings, email_delta)
+                attachments_size = sum(part.encoded_size() for part in parts if isinstance(part, AttachmentSource))
+                if attachments_size > GMAIL_MAX_MESSAGE_BYTES:
+                    print(f"⚠️ Attachments are {attachments_size / 1024 / 1024:.1f} MB encoded, Gmail rejects messages over 25 MB (try ATTACHMENT_MODE=zip)")
+
+                # Send email, the message is generated while it is written to the connection
+                size, refused = delivery.send(message_recipients, lambda: iter_message_chunks(headers, parts))
+                sent += 1
+                log(f"📦 Message size: {size / 1024:.0f} KB")
+                for recipient, (code, response) in refused.items():
+                    log(f"⚠️ Recipient {recipient} refused: {code} {response}")
+                log(f"✅ Email sent successfully to {', '.join(message_recipients)} ({delivery.name})")
+                student_count = len(snapshot.data) if student_ids is None else len(student_ids)
+                log(f"📧 Email includes comprehensive report for {student_count} student(s)")
+                log(f"📎 {len(report_files)} individual student reports attached")
+            except Exception as e:
+                print(f"❌ Failed to send email: {str(e)}")
+            finally:
+                close_message_parts(parts)
+    finally:
+        delivery.close()
+
+    # Always print success message even when logging is disabled
+    if sent and not LOGGING_ENABLED:
+        print("✅ Email sent successfully" if sent == 1 else f"✅ {sent} emails sent successfully")
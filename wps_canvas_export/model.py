@@ -0,0 +1,167 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone, timedelta
+from .config import pacific
+
+# ─── Assignment Records ─────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class Assignment:
+    """One student's view of an assignment: the assignment plus their submission.
+
+    Slotted so the thousands of records an observer account accumulates over a year
+    carry no per-instance dict. All timestamps are aware Pacific datetimes.
+    """
+    id: int
+    name: str
+    due_at: datetime | None
+    points_possible: float | None
+    score: float | None
+    grade: str | None
+    missing: bool | None
+    submitted_at: datetime | None
+    html_url: str | None
+    graded_at: datetime | None = None
+    unlock_at: datetime | None = None
+    lock_at: datetime | None = None
+
+# Assignment record fields holding timestamps, all normalized to aware Pacific datetimes at ingest
+ASSIGNMENT_TIMESTAMPS = ("due_at", "submitted_at", "graded_at", "unlock_at", "lock_at")
+
+def parse_canvas_datetime(value):
+    """Convert a Canvas ISO 8601 timestamp into an aware Pacific datetime (None when empty or invalid)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.astimezone(pacific)
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(pacific)
+
+def assignment_to_json(assignment):
+    """Serialize an Assignment for the sync state file"""
+    data = {field.name: getattr(assignment, field.name) for field in fields(Assignment)}
+    for field in ASSIGNMENT_TIMESTAMPS:
+        data[field] = data[field].isoformat() if data[field] else None
+    return data
+
+def assignment_from_json(data):
+    """Restore an Assignment serialized by assignment_to_json"""
+    values = {field.name: data.get(field.name) for field in fields(Assignment)}
+    for field in ASSIGNMENT_TIMESTAMPS:
+        values[field] = parse_canvas_datetime(values[field])
+    return Assignment(**values)
+
+@dataclass(slots=True)
+class AssignmentTags:
+    """Classification of one assignment as of a point in time (see classify_assignment)"""
+    state: str | None
+    status_class: str
+    status_label: str
+    due_class: str
+    score_class: str
+    due_this_week: bool
+    is_missing: bool
+    is_maybe_redo: bool
+    is_low_score: bool
+
+
+# ─── Due Date Index ─────────────────────────────────────────────────────────
+
+class DueDateIndex:
+    """A student's assignments sorted by due date for O(log n + k) window queries.
+
+    Entries are (course_id, assignment) pairs. Assignments without a due date are kept
+    apart in undated and never fall inside a window.
+    """
+
+    def __init__(self, student_data=None):
+        self.entries = []
+        self.undated = []
+        if student_data:
+            for course_id, course_data in student_data["courses"].items():
+                for assignment in course_data["assignments"]:
+                    (self.entries if assignment.due_at else self.undated).append((course_id, assignment))
+        # Stable sort, assignments due at the same moment keep their course order
+        self.entries.sort(key=lambda entry: entry[1].due_at)
+        self.keys = [assignment.due_at for _, assignment in self.entries]
+
+    def window(self, start=None, end=None, include_end=True):
+        """Entries due between start and end (inclusive, or exclusive of end), either bound may be None"""
+        lo = bisect_left(self.keys, start) if start is not None else 0
+        if end is None:
+            hi = len(self.keys)
+        else:
+            hi = (bisect_right if include_end else bisect_left)(self.keys, end)
+        return self.entries[lo:hi]
+
+    def overdue(self, current_time):
+        """Entries due before current_time, oldest first"""
+        return self.window(end=current_time, include_end=False)
+
+    def upcoming(self, current_time, days=7):
+        """Entries due within the next days days, soonest first"""
+        return self.window(current_time, current_time + timedelta(days=days))
+
+    def since(self, start):
+        """A new index without the entries due before start"""
+        index = DueDateIndex()
+        lo = bisect_left(self.keys, start)
+        index.entries, index.keys, index.undated = self.entries[lo:], self.keys[lo:], self.undated
+        return index
+
+def build_due_date_indexes(data):
+    """Build the DueDateIndex of every student in data, returns {student_id: index}"""
+    return {student_id: DueDateIndex(student_data) for student_id, student_data in data.items()}
+
+def apply_due_date_filter(data, indexes, cutoff):
+    """Drop assignments due before cutoff, returns the filtered (data, indexes).
+
+    The assignments to drop are one range of each student's index, only the courses that
+    have any are rebuilt and everything else is passed through unchanged.
+    """
+    filtered_data = {}
+    filtered_indexes = {}
+    for student_id, student_data in data.items():
+        dropped = indexes[student_id].window(end=cutoff, include_end=False)
+        if not dropped:
+            filtered_data[student_id] = student_data
+            filtered_indexes[student_id] = indexes[student_id]
+            continue
+        dropped_ids = {id(assignment) for _, assignment in dropped}
+        courses = dict(student_data["courses"])
+        for course_id in {course_id for course_id, _ in dropped}:
+            course_data = courses[course_id]
+            courses[course_id] = {**course_data, "assignments": [a for a in course_data["assignments"] if id(a) not in dropped_ids]}
+        filtered_data[student_id] = {**student_data, "courses": courses}
+        filtered_indexes[student_id] = indexes[student_id].since(cutoff)
+    return filtered_data, filtered_indexes
+
+
+# ─── Snapshot ───────────────────────────────────────────────────────────────
+
+@dataclass
+class Snapshot:
+    """students_data as of one run, plus what classify() derives from it.
+
+    data is {student_id: {"name", "courses": {course_id: {"name", "current_score",
+    "final_score", "html_url", "assignments": [Assignment, ...]}}}} in Canvas order.
+    taken_at is the aware UTC time the data was fetched and the reports are rendered
+    as of it. run_id is the snapshot store run holding the data, if it was stored.
+    due_date_before is the cutoff classify() dropped earlier assignments by, if any.
+    """
+    data: dict
+    taken_at: datetime
+    run_id: int | None = None
+    due_indexes: dict | None = None
+    classifications: dict | None = None
+    due_date_before: datetime | None = None
+
+    @property
+    def current_time(self):
+        """taken_at in Pacific time"""
+        return self.taken_at.astimezone(pacific)
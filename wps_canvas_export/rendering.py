@@ -0,0 +1,1041 @@
+import os
+import json
+import hashlib
+import tempfile
+import multiprocessing
+from dataclasses import astuple
+from functools import lru_cache
+from datetime import datetime
+from .classification import classify_students
+from .config import CACHE_DIR, COURSE_ALIASES, RENDER_WORKERS, SKIP_UNCHANGED_REPORTS, log, pacific
+from .model import assignment_to_json
+
+# ─── HTML Export Functions ──────────────────────────────────────────────────
+
+def get_course_status_class(course_data):
+    """Determine CSS class for course based on current score"""
+    classes = []
+
+    current_score = course_data.get("current_score")
+    if current_score is not None:
+        try:
+            if float(current_score) < 80:
+                classes.append("low-grade")
+        except (ValueError, TypeError):
+            pass
+    else:
+        classes.append("no-grade")
+
+    return " ".join(classes)
+
+# Static stylesheet of the HTML reports
+REPORT_CSS = """        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background-color: #f5f5f5;
+            line-height: 1.6;
+        }
+
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            overflow: hidden;
+        }
+
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+        }
+
+        .header h1 {
+            margin: 0;
+            font-size: 2.5em;
+            font-weight: 300;
+        }
+
+        .timestamp {
+            margin-top: 10px;
+            opacity: 0.9;
+            font-size: 1.1em;
+        }
+
+        .students-container {
+            padding: 30px;
+        }
+
+        .student-section {
+            margin-bottom: 30px;
+            border: 1px solid #ddd;
+            border-radius: 12px;
+            overflow: hidden;
+            background: white;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+        }
+
+        .student-toggle {
+            display: none;
+        }
+
+        .student-header {
+            padding: 20px 25px;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            cursor: pointer;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            transition: all 0.3s ease;
+            user-select: none;
+        }
+
+        .student-header:hover {
+            background: linear-gradient(135deg, #5a6fd8 0%, #6a4190 100%);
+        }
+
+        .student-name {
+            font-size: 1.8em;
+            font-weight: 600;
+            margin: 0;
+        }
+
+        .student-expand-icon {
+            font-size: 1.5em;
+            transition: transform 0.3s ease;
+        }
+
+        .student-toggle:checked + .student-header .student-expand-icon {
+            transform: rotate(180deg);
+        }
+
+        .student-content {
+            display: none;
+            padding: 25px;
+            max-height: 0;
+            overflow: hidden;
+            transition: max-height 0.3s ease;
+        }
+
+        .student-toggle:checked + .student-header + .student-content {
+            display: block;
+            max-height: 5000px;
+        }
+
+
+
+        .course {
+            margin-bottom: 20px;
+            border: 1px solid #ddd;
+            border-radius: 8px;
+            overflow: hidden;
+            background: white;
+        }
+
+        .course-toggle {
+            display: none;
+        }
+
+        .course-header {
+            padding: 15px 20px;
+            background: #f8f9fa;
+            cursor: pointer;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            transition: background-color 0.3s ease;
+            user-select: none;
+        }
+
+        .course-header:hover {
+            background: #e9ecef;
+        }
+
+        .course-header.low-grade {
+            background: #fff3cd;
+            border-left: 4px solid #ffc107;
+        }
+
+        .course-header.no-grade {
+            background: #f8d7da;
+            border-left: 4px solid #dc3545;
+        }
+
+        .course-title {
+            font-size: 1.2em;
+            font-weight: 600;
+            color: #333;
+            text-decoration: none;
+        }
+
+        .course-title:hover {
+            color: #667eea;
+        }
+
+        .course-grades {
+            display: flex;
+            gap: 15px;
+            align-items: center;
+        }
+
+        .grade {
+            padding: 5px 12px;
+            border-radius: 20px;
+            font-weight: 600;
+            font-size: 0.9em;
+        }
+
+        .current-grade {
+            background: #d4edda;
+            color: #155724;
+        }
+
+        .current-grade.low-grade {
+            background: #f8d7da;
+            color: #721c24;
+        }
+
+        .final-grade {
+            background: #cce5ff;
+            color: #004085;
+        }
+
+        .no-grade {
+            background: #f8d7da;
+            color: #721c24;
+        }
+
+        .expand-icon {
+            font-size: 1.2em;
+            transition: transform 0.3s ease;
+        }
+
+        .course-toggle:checked + .course-header .expand-icon {
+            transform: rotate(180deg);
+        }
+
+        .course-content {
+            display: none;
+            padding: 0;
+            max-height: 0;
+            overflow: hidden;
+            transition: max-height 0.3s ease;
+        }
+
+        .course-toggle:checked + .course-header + .course-content {
+            display: block;
+            max-height: 2000px;
+        }
+
+        .assignments-table {
+            width: 100%;
+            border-collapse: collapse;
+        }
+
+        .assignments-table th {
+            background: #f8f9fa;
+            padding: 12px 15px;
+            text-align: left;
+            font-weight: 600;
+            color: #495057;
+            border-bottom: 2px solid #dee2e6;
+        }
+
+        .assignments-table td {
+            padding: 12px 15px;
+            border-bottom: 1px solid #dee2e6;
+            vertical-align: top;
+        }
+
+        .assignment-name {
+            color: #333;
+            text-decoration: none;
+            font-weight: 500;
+        }
+
+        .assignment-name:hover {
+            color: #667eea;
+            text-decoration: underline;
+        }
+
+        .overdue {
+            background-color: #f8d7da !important;
+        }
+
+        .grading-overdue {
+            background-color: #ffeaa7 !important;
+            border-left: 4px solid #fdcb6e !important;
+        }
+
+        .awaiting-grade {
+            background-color: #e8f4fd !important;
+            border-left: 4px solid #74b9ff !important;
+        }
+
+        .upcoming-no-submission {
+            background-color: #f3e5f5 !important;
+            border-left: 4px solid #9c27b0 !important;
+        }
+
+        .missing-score {
+            background-color: #fff3cd !important;
+        }
+
+        .low-score {
+            background-color: #ffe6e6 !important;
+        }
+
+        .score {
+            font-weight: 600;
+        }
+
+        .score.low-score {
+            color: #dc3545;
+        }
+
+        .due-date {
+            white-space: nowrap;
+        }
+
+        .due-date.overdue {
+            color: #dc3545;
+            font-weight: 600;
+        }
+
+        .summary-stats {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+
+        .stat-card {
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            border-left: 4px solid #667eea;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+
+        .stat-number {
+            font-size: 2em;
+            font-weight: 700;
+            color: #667eea;
+            margin-bottom: 5px;
+        }
+
+        .stat-label {
+            color: #666;
+            font-size: 0.9em;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+        }
+
+        .alert {
+            background: #f8d7da;
+            border: 1px solid #f5c6cb;
+            color: #721c24;
+            padding: 15px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+        }
+
+        .alert.warning {
+            background: #fff3cd;
+            border-color: #ffeaa7;
+            color: #856404;
+        }
+
+        .alert.success {
+            background: #d4edda;
+            border-color: #c3e6cb;
+            color: #155724;
+        }
+
+        .instructions {
+            margin-bottom: 20px;
+            padding: 15px;
+            background: #e8f4fd;
+            border-radius: 8px;
+            border-left: 4px solid #74b9ff;
+            font-size: 14px;
+            color: #004085;
+        }
+
+        @media (max-width: 768px) {
+            .students-container {
+                padding: 15px;
+            }
+
+            .student-header {
+                padding: 15px 20px;
+                flex-direction: column;
+                align-items: flex-start;
+                gap: 10px;
+            }
+
+            .student-name {
+                font-size: 1.5em;
+            }
+
+            .course-header {
+                flex-direction: column;
+                align-items: flex-start;
+                gap: 10px;
+            }
+
+            .assignments-table {
+                font-size: 0.9em;
+                display: block;
+                overflow-x: auto;
+                white-space: nowrap;
+            }
+
+            .assignments-table th,
+            .assignments-table td {
+                padding: 8px 10px;
+                min-width: 120px;
+            }
+
+            .summary-stats {
+                grid-template-columns: repeat(2, 1fr);
+            }
+        }
+"""
+
+REPORT_FOOTER = """
+        </div>
+    </div>
+</body>
+</html>"""
+
+@lru_cache(maxsize=None)
+def report_header(timestamp):
+    """Page head and header of an HTML report, rendered once per timestamp"""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Canvas Academic Report - {timestamp}</title>
+    <style>
+{REPORT_CSS}    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📚 Canvas Academic Report</h1>
+            <div class="timestamp">Generated on {timestamp}</div>
+        </div>
+
+        <div class="students-container">"""
+
+def student_toggle_html(student_id, checked):
+    """Opening of a student section, the only part that differs between the combined and individual reports"""
+    return f"""
+        <div class="student-section">
+            <input type="checkbox" id="student-{student_id}" class="student-toggle" {"checked" if checked else ""}>"""
+
+def iter_student_fragment(student_id, student_data, summary):
+    """Yield a student's section of the HTML report in chunks, everything after student_toggle_html"""
+    # Statistics from the classification pass
+    total_courses = summary["total_courses"]
+    total_assignments = summary["total_assignments"]
+    overdue_count = summary["overdue_count"]
+    missing_scores = summary["missing_scores"]
+    grading_overdue_count = summary["grading_overdue_count"]
+    awaiting_grade_count = summary["awaiting_grade_count"]
+    upcoming_no_submission_count = summary["upcoming_no_submission_count"]
+
+    yield f"""
+            <label for="student-{student_id}" class="student-header">
+                <h2 class="student-name">{student_data['name']}</h2>
+                <span class="student-expand-icon">▼</span>
+            </label>
+            <div class="student-content">
+
+            <div class="summary-stats">
+                <div class="stat-card">
+                    <div class="stat-number">{total_courses}</div>
+                    <div class="stat-label">Active Courses</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">{total_assignments}</div>
+                    <div class="stat-label">Total Assignments</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">{overdue_count}</div>
+                    <div class="stat-label">Overdue Items</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">{grading_overdue_count}</div>
+                    <div class="stat-label">Grading Overdue</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">{awaiting_grade_count}</div>
+                    <div class="stat-label">Awaiting Grade</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">{upcoming_no_submission_count}</div>
+                    <div class="stat-label">Upcoming (No Submission)</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">{missing_scores}</div>
+                    <div class="stat-label">Missing Scores</div>
+                </div>
+            </div>"""
+
+    # Add alerts for issues
+    if overdue_count > 0:
+        yield f"""
+            <div class="alert">
+                <strong>⚠️ Attention Required:</strong> {overdue_count} overdue assignment(s) need immediate attention.
+            </div>"""
+
+    if grading_overdue_count > 0:
+        yield f"""
+            <div class="alert warning">
+                <strong>📚 Grading Delayed:</strong> {grading_overdue_count} assignment(s) submitted but not graded for 3+ days.
+            </div>"""
+
+    if awaiting_grade_count > 3:
+        yield f"""
+            <div class="alert warning">
+                <strong>📝 Note:</strong> {awaiting_grade_count} assignments are awaiting grading.
+            </div>"""
+
+    if upcoming_no_submission_count > 0:
+        yield f"""
+            <div class="alert warning">
+                <strong>🔮 Upcoming Deadlines:</strong> {upcoming_no_submission_count} assignment(s) due soon with no submission yet.
+            </div>"""
+
+    if overdue_count == 0 and grading_overdue_count == 0 and missing_scores <= 1:
+        yield """
+            <div class="alert success">
+                <strong>✅ Great Job:</strong> All assignments are up to date!
+            </div>"""
+
+    # Add instructions for mobile users
+    yield """
+            <div class="instructions">
+                💡 <strong>Tip:</strong> Click on any course header to expand/collapse and view assignments
+            </div>"""
+
+    # Generate courses
+    for course_id, course_data in student_data['courses'].items():
+        course_display = COURSE_ALIASES.get(course_data["name"], course_data["name"])
+        course_status_class = get_course_status_class(course_data)
+
+        current_score = course_data.get("current_score")
+        final_score = course_data.get("final_score")
+
+        current_grade_display = f"{current_score:.1f}%" if current_score is not None else "No grade"
+        final_grade_display = f"{final_score:.1f}%" if final_score is not None else "0.0%"
+
+        current_grade_class = "current-grade"
+        if current_score is not None and current_score < 80:
+            current_grade_class += " low-grade"
+        elif current_score is None:
+            current_grade_class = "no-grade"
+
+        yield f"""
+            <div class="course">
+                <input type="checkbox" id="course-{student_id}-{course_id}" class="course-toggle">
+                <label for="course-{student_id}-{course_id}" class="course-header {course_status_class}">
+                    <div style="display: flex; justify-content: space-between; align-items: center; width: 100%;">
+                        <a href="{course_data.get('html_url', '#')}" class="course-title" target="_blank" onclick="event.stopPropagation()">
+                            {course_display}
+                        </a>
+                        <div class="course-grades">
+                            <span class="{current_grade_class} grade">Current: {current_grade_display}</span>
+                            <span class="final-grade grade">Final: {final_grade_display}</span>
+                            <span class="expand-icon">▼</span>
+                        </div>
+                    </div>
+                </label>
+                <div class="course-content">
+                    <table class="assignments-table">
+                        <thead>
+                            <tr>
+                                <th>Assignment</th>
+                                <th>Score</th>
+                                <th>Possible</th>
+                                <th>Due Date</th>
+                                <th>Status</th>
+                            </tr>
+                        </thead>
+                        <tbody>"""
+
+        # Sort assignments by due date, keeping each paired with its tags
+        sorted_assignments = sorted(
+            zip(course_data["assignments"], summary["courses"][course_id]),
+            key=lambda pair: (pair[0].due_at or datetime.max.replace(tzinfo=pacific))
+        )
+
+        for assignment, tags in sorted_assignments:
+            due_str = assignment.due_at.strftime("%Y-%m-%d %I:%M %p") if assignment.due_at else "No due date"
+            score_display = assignment.score if assignment.score is not None else "—"
+            points_possible = assignment.points_possible if assignment.points_possible is not None else "—"
+
+            yield f"""
+                            <tr class="{tags.status_class}">
+                                <td><a href="{assignment.html_url}" class="assignment-name" target="_blank">{assignment.name}</a></td>
+                                <td class="{tags.score_class}">{score_display}</td>
+                                <td>{points_possible}</td>
+                                <td class="{tags.due_class}">{due_str}</td>
+                                <td>{tags.status_label}</td>
+                            </tr>"""
+
+        yield """
+                        </tbody>
+                    </table>
+                </div>
+            </div>"""
+
+    yield """
+            </div>
+        </div>"""
+
+def snapshot_summaries(snapshot):
+    """The snapshot's classifications (see classify_students), computed here when it was not classified"""
+    if snapshot.classifications is None:
+        return classify_students(snapshot.data, snapshot.current_time, snapshot.due_indexes)
+    return snapshot.classifications
+
+def selected_students(data, student_ids=None):
+    """(student_id, student_data) pairs of student_ids in data order, every student when None"""
+    if student_ids is None:
+        return list(data.items())
+    return [(student_id, student_data) for student_id, student_data in data.items() if student_id in student_ids]
+
+def iter_html_report(snapshot, student_ids=None):
+    """Yield the HTML report for all students or a subset in chunks, nothing is accumulated"""
+    timestamp = snapshot.current_time.strftime("%Y-%m-%d %I:%M %p")
+    classifications = snapshot_summaries(snapshot)
+
+    yield report_header(timestamp)
+    # Generate expandable sections for each student, the first one expanded
+    for i, (student_id, student_data) in enumerate(selected_students(snapshot.data, student_ids)):
+        yield student_toggle_html(student_id, checked=(i == 0))
+        yield from iter_student_fragment(student_id, student_data, classifications[student_id])
+    yield REPORT_FOOTER
+
+def write_html_report(out, snapshot, student_ids=None):
+    """Stream the HTML report into a text file object (a file, gzip.open(..., "wt"), io.StringIO...)"""
+    for chunk in iter_html_report(snapshot, student_ids):
+        out.write(chunk)
+
+def generate_html_report(snapshot, student_ids=None):
+    """Generate comprehensive HTML report for all students or a subset as one string"""
+    return "".join(iter_html_report(snapshot, student_ids))
+
+class ReportFile:
+    """A report file being streamed to disk. A failed open or write is kept in error
+    and ends the file, so one bad file does not stop the others."""
+
+    def __init__(self, filename, unchanged=False):
+        self.filename = filename
+        self.error = None
+        # unchanged: kept as written by a previous run (SKIP_UNCHANGED_REPORTS), not opened
+        self.unchanged = unchanged
+        self.file = None
+        if unchanged:
+            return
+        try:
+            self.file = open(filename, 'w', encoding='utf-8')
+        except Exception as e:
+            self.error = e
+
+    def write(self, chunk):
+        if self.file is None:
+            return
+        try:
+            self.file.write(chunk)
+        except Exception as e:
+            self.error = e
+            self.close()
+
+    def close(self):
+        if self.file is not None:
+            try:
+                self.file.close()
+            except Exception as e:
+                self.error = self.error or e
+            self.file = None
+        return self.error is None
+
+def report_file_name(student_data):
+    """Base file name of a student's individual reports (special characters removed)"""
+    return "".join(c for c in student_data['name'] if c.isalnum() or c in (' ', '-', '_')).strip()
+
+def write_student_reports(student_id, student_data, summary, current_time, section_out=None, output_dir=""):
+    """Write a student's individual HTML report and action items text report to output_dir
+    ("" is the working directory).
+
+    The student's section chunks are also written to section_out (the overall report or
+    a spool file) as they are rendered. Returns the closed (html, text) ReportFiles.
+    """
+    clean_name = report_file_name(student_data)
+    html_report = ReportFile(os.path.join(output_dir, f"{clean_name}.html"))
+    html_report.write(report_header(current_time.strftime("%Y-%m-%d %I:%M %p")))
+    html_report.write(student_toggle_html(student_id, checked=True))
+    for chunk in iter_student_fragment(student_id, student_data, summary):
+        html_report.write(chunk)
+        if section_out:
+            section_out.write(chunk)
+    html_report.write(REPORT_FOOTER)
+    html_report.close()
+
+    text_report = ReportFile(os.path.join(output_dir, f"{clean_name}_ActionItems.txt"))
+    text_report.write(generate_action_items_text_report(student_id, student_data, summary, current_time))
+    text_report.close()
+    return html_report, text_report
+
+def render_student_task(task):
+    """Process pool entry point, write_student_reports for one pickled student snapshot.
+
+    The student's section of the overall report goes to a spool file the parent
+    copies into canvas.html in student order.
+    """
+    student_id, student_data, summary, current_time, section_path, output_dir = task
+    section = ReportFile(section_path)
+    html_report, text_report = write_student_reports(student_id, student_data, summary, current_time, section, output_dir)
+    section.close()
+    return html_report, text_report, section
+
+def render_pool_workers(student_count):
+    """Number of render processes to use for student_count students, 1 means render serially.
+
+    Workers are forked so they inherit the configuration without re-importing it,
+    platforms without fork render serially.
+    """
+    workers = min(RENDER_WORKERS or os.cpu_count() or 1, student_count)
+    if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        log("ℹ️ RENDER_WORKERS needs the fork start method, rendering serially")
+        return 1
+    return max(workers, 1)
+
+def write_report_files(snapshot, include_overall=True, output_dir=""):
+    """Write canvas.html and every student's individual HTML and action items reports
+    to output_dir ("" is the working directory).
+
+    Serially every student section is rendered once and streamed to both the overall
+    report and the student's own file, so memory stays flat. With RENDER_WORKERS
+    students are rendered across a process pool, each worker gets one student's data
+    and writes its files plus a spool of its section for canvas.html.
+
+    Returns (overall ReportFile or None, {student_id: (html ReportFile, text ReportFile)})
+    in student order, all closed.
+    """
+    if SKIP_UNCHANGED_REPORTS:
+        return write_changed_report_files(snapshot, include_overall, output_dir)
+    students_data = snapshot.data
+    current_time = snapshot.current_time
+    classifications = snapshot_summaries(snapshot)
+
+    overall = ReportFile(os.path.join(output_dir, "canvas.html")) if include_overall else None
+    if overall:
+        overall.write(report_header(current_time.strftime("%Y-%m-%d %I:%M %p")))
+    student_reports = {}
+
+    if render_pool_workers(len(students_data)) == 1:
+        for i, (student_id, student_data) in enumerate(students_data.items()):
+            if overall:
+                overall.write(student_toggle_html(student_id, checked=(i == 0)))
+            student_reports[student_id] = write_student_reports(
+                student_id, student_data, classifications[student_id], current_time, overall, output_dir
+            )
+    else:
+        with tempfile.TemporaryDirectory(prefix="canvas-render-") as spool_dir:
+            tasks = (
+                (student_id, student_data, classifications[student_id], current_time, os.path.join(spool_dir, f"{i}.html"), output_dir)
+                for i, (student_id, student_data) in enumerate(students_data.items())
+            )
+            # Results come back in students_data order while later students are still rendering
+            for i, (student_id, result) in enumerate(zip(students_data, render_student_tasks(tasks, len(students_data)))):
+                html_report, text_report, section = result
+                student_reports[student_id] = (html_report, text_report)
+                if overall:
+                    overall.write(student_toggle_html(student_id, checked=(i == 0)))
+                if section.error is not None:
+                    if overall:
+                        overall.error = overall.error or section.error
+                    continue
+                if overall:
+                    with open(section.filename, encoding='utf-8') as f:
+                        for chunk in iter(lambda: f.read(65536), ""):
+                            overall.write(chunk)
+                os.remove(section.filename)
+
+    if overall:
+        overall.write(REPORT_FOOTER)
+        overall.close()
+    return overall, student_reports
+
+def render_student_tasks(tasks, count):
+    """Run render_student_task over tasks, across the process pool when it pays off.
+    Yields the results in task order."""
+    workers = render_pool_workers(count)
+    if workers == 1:
+        yield from map(render_student_task, tasks)
+        return
+    with multiprocessing.get_context("fork").Pool(workers) as pool:
+        yield from pool.imap(render_student_task, tasks)
+
+def write_changed_report_files(snapshot, include_overall=True, output_dir=""):
+    """write_report_files for SKIP_UNCHANGED_REPORTS.
+
+    Only students whose content hash (see student_content_hash) differs from the report
+    manifest, or whose files are gone, are rendered. Each student's section is kept in
+    CACHE_DIR/report_sections so canvas.html can be reassembled without rendering the
+    others, and it is left alone when no student changed. Reports that were kept are
+    returned as unchanged ReportFiles.
+    """
+    students_data = snapshot.data
+    current_time = snapshot.current_time
+    classifications = snapshot_summaries(snapshot)
+    manifest = load_report_manifest()
+    format_hash = report_format_hash()
+    previous = manifest["students"] if manifest.get("format") == format_hash else {}
+    sections_dir = os.path.join(CACHE_DIR, "report_sections")
+    os.makedirs(sections_dir, exist_ok=True)
+
+    entries = {}
+    changed = []
+    for student_id, student_data in students_data.items():
+        clean_name = report_file_name(student_data)
+        entry = {
+            "hash": student_content_hash(student_data, classifications[student_id]),
+            "html": os.path.join(output_dir, f"{clean_name}.html"),
+            "text": os.path.join(output_dir, f"{clean_name}_ActionItems.txt"),
+            "section": os.path.join(sections_dir, f"{student_id}.html")
+        }
+        entries[str(student_id)] = entry
+        if previous.get(str(student_id)) != entry or not all(os.path.exists(entry[k]) for k in ("html", "text", "section")):
+            changed.append(student_id)
+
+    print(f"ℹ️  Reports: {len(changed)} of {len(students_data)} students changed")
+    for student_id in changed:
+        log(f"   ✏️ {students_data[student_id]['name']}")
+
+    student_reports = {}
+    tasks = (
+        (student_id, students_data[student_id], classifications[student_id], current_time, entries[str(student_id)]["section"], output_dir)
+        for student_id in changed
+    )
+    for student_id, (html_report, text_report, section) in zip(changed, render_student_tasks(tasks, len(changed))):
+        student_reports[student_id] = (html_report, text_report)
+        if html_report.error or text_report.error or section.error:
+            # Not recorded, so the next run renders this student again
+            del entries[str(student_id)]
+    for student_id in students_data:
+        if student_id not in student_reports:
+            entry = entries[str(student_id)]
+            student_reports[student_id] = (ReportFile(entry["html"], unchanged=True), ReportFile(entry["text"], unchanged=True))
+
+    overall = None
+    if include_overall:
+        overall_path = os.path.join(output_dir, "canvas.html")
+        if changed or not os.path.exists(overall_path):
+            overall = ReportFile(overall_path)
+            overall.write(report_header(current_time.strftime("%Y-%m-%d %I:%M %p")))
+            for i, student_id in enumerate(students_data):
+                overall.write(student_toggle_html(student_id, checked=(i == 0)))
+                try:
+                    with open(os.path.join(sections_dir, f"{student_id}.html"), encoding='utf-8') as f:
+                        for chunk in iter(lambda: f.read(65536), ""):
+                            overall.write(chunk)
+                except OSError as e:
+                    overall.error = overall.error or e
+            overall.write(REPORT_FOOTER)
+            overall.close()
+        else:
+            overall = ReportFile(overall_path, unchanged=True)
+
+    # Drop the sections of students no longer observed
+    for filename in os.listdir(sections_dir):
+        if filename.removesuffix(".html") not in entries:
+            os.remove(os.path.join(sections_dir, filename))
+    save_report_manifest({"format": format_hash, "students": entries})
+    return overall, student_reports
+
+
+# ─── Report Manifest ────────────────────────────────────────────────────────
+
+# Bump whenever the rendering of a student's reports changes (sections, labels, the action
+# items text), so SKIP_UNCHANGED_REPORTS renders every report again. The stylesheet and page
+# templates are part of report_format_hash already.
+REPORT_FORMAT_VERSION = 1
+
+def student_content_hash(student_data, summary):
+    """Hash of everything a student's reports are rendered from: the normalized student
+    data and the classification of each assignment, not the rendered text or run time"""
+    content = {
+        "name": student_data["name"],
+        "courses": [
+            {
+                "id": course_id,
+                **{key: value for key, value in course_data.items() if key != "assignments"},
+                "assignments": [assignment_to_json(a) for a in course_data["assignments"]],
+                "tags": [astuple(tags) for tags in summary["courses"][course_id]]
+            }
+            for course_id, course_data in student_data["courses"].items()
+        ]
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+def report_format_hash():
+    """Hash of REPORT_FORMAT_VERSION, the page templates and COURSE_ALIASES, so a change to
+    how reports look re-renders every report while unrelated code changes keep them"""
+    content = {
+        "version": REPORT_FORMAT_VERSION,
+        "header": report_header("{timestamp}"),
+        "toggle": student_toggle_html("{student_id}", checked=True),
+        "footer": REPORT_FOOTER,
+        "aliases": COURSE_ALIASES
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+def report_manifest_path():
+    return os.path.join(CACHE_DIR, "report_manifest.json")
+
+def load_report_manifest():
+    """Load the report manifest of the previous run (empty when there is none)"""
+    try:
+        with open(report_manifest_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"students": {}}
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read report manifest, rendering every report: {e}")
+        return {"students": {}}
+
+def save_report_manifest(manifest):
+    """Write the report manifest atomically"""
+    try:
+        tmp_path = report_manifest_path() + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, report_manifest_path())
+    except OSError as e:
+        print(f"⚠️ Could not save report manifest: {e}")
+
+def save_html_report(snapshot, overall=None, output_dir=""):
+    """Save the overall HTML report to canvas.html in output_dir, or log the result of an
+    already written one (see write_report_files)"""
+    if overall is None:
+        overall = ReportFile(os.path.join(output_dir, "canvas.html"))
+        write_html_report(overall, snapshot)
+        overall.close()
+
+    if overall.unchanged:
+        log(f"\n📄 HTML report unchanged: {overall.filename}")
+        return overall.filename
+    if overall.error is None:
+        log(f"\n📄 HTML report saved as: {overall.filename}")
+        log(f"   Open this file in your browser to view the interactive report.")
+        return overall.filename
+    log(f"\n❌ Error saving HTML report: {overall.error}")
+    return None
+
+def generate_action_items_text_report(student_id, student_data, summary, current_time):
+    """Generate a text report for missing and poorly scored assignments for a student"""
+    lines = []
+
+    # Header
+    lines.append("=" * 70)
+    lines.append(f"ACTION ITEMS REPORT - {student_data['name'].upper()}")
+    lines.append(f"Generated: {current_time.strftime('%Y-%m-%d %I:%M %p')}")
+    lines.append("=" * 70)
+    lines.append("")
+
+    # Missing (overdue with missing or zero score) and maybe redo (< 66%) buckets
+    missing_by_course = summary["missing_by_course"]
+    maybe_redo_by_course = summary["maybe_redo_by_course"]
+
+    # Section 1: Missing Assignments
+    total_missing = sum(len(assignments) for assignments in missing_by_course.values())
+    lines.append(f"🚨 MISSING ASSIGNMENTS: {total_missing}")
+    lines.append("-" * 70)
+
+    if missing_by_course:
+        # Courses alphabetically, assignments by due date descending (most recent first)
+        for course_name, assignments in missing_by_course.items():
+            lines.append(f"\n📚 {course_name} ({len(assignments)})")
+            for assignment in assignments:
+                due_str = assignment.due_at.strftime("%Y-%m-%d") if assignment.due_at else "No due date"
+                score_str = f"{assignment.score}" if assignment.score is not None else "—"
+                points_str = f"{assignment.points_possible}" if assignment.points_possible is not None else "—"
+                lines.append(f"   • {due_str} | {assignment.name} | {score_str}/{points_str}")
+            lines.append("")
+    else:
+        lines.append("   ✅ No missing assignments!")
+        lines.append("")
+
+    # Section 2: Maybe Redo Assignments
+    lines.append("")
+    total_redo = sum(len(assignments) for assignments in maybe_redo_by_course.values())
+    lines.append(f"⚠️  MAYBE REDO (Scored < 66%): {total_redo}")
+    lines.append("-" * 70)
+
+    if maybe_redo_by_course:
+        # Courses alphabetically, assignments by due date descending (most recent first)
+        for course_name, assignments in maybe_redo_by_course.items():
+            lines.append(f"\n📚 {course_name} ({len(assignments)})")
+            for assignment in assignments:
+                due_str = assignment.due_at.strftime("%Y-%m-%d") if assignment.due_at else "No due date"
+                percentage = (float(assignment.score) / float(assignment.points_possible)) * 100
+                lines.append(f"   • {due_str} | {assignment.score}/{assignment.points_possible} ({percentage:.1f}%) | {assignment.name}")
+            lines.append("")
+    else:
+        lines.append("   ✅ No assignments scored below 66%!")
+        lines.append("")
+
+    lines.append("")
+    lines.append("=" * 70)
+    lines.append("End of Report")
+    lines.append("=" * 70)
+
+    # Use Windows-style line breaks (\r\n) for better compatibility with print preview
+    return "\r\n".join(lines)
+
+def save_individual_student_reports(snapshot, student_reports=None, output_dir=""):
+    """Generate and save individual HTML reports and text action items for each student.
+
+    student_reports ({student_id: (html, text) ReportFiles} from write_report_files) are
+    reports already written alongside canvas.html, otherwise they are written to output_dir.
+    Returns the saved file names in student order.
+    """
+    if student_reports is None:
+        _, student_reports = write_report_files(snapshot, include_overall=False, output_dir=output_dir)
+    saved_files = []
+
+    for student_id, student_data in snapshot.data.items():
+        html_report, text_report = student_reports[student_id]
+
+        # 1. HTML report
+        if html_report.unchanged:
+            log(f"📄 Individual HTML report unchanged: {html_report.filename}")
+            saved_files.append(html_report.filename)
+        elif html_report.error is None:
+            log(f"📄 Individual HTML report saved: {html_report.filename}")
+            saved_files.append(html_report.filename)
+        else:
+            log(f"❌ Error saving HTML report for {student_data['name']}: {html_report.error}")
+
+        # 2. Text action items report
+        if text_report.unchanged:
+            log(f"📝 Action items report unchanged: {text_report.filename}")
+            saved_files.append(text_report.filename)
+        elif text_report.error is None:
+            log(f"📝 Action items report saved: {text_report.filename}")
+            saved_files.append(text_report.filename)
+        else:
+            log(f"❌ Error saving action items for {student_data['name']}: {text_report.error}")
+
+    return saved_files
@@ -0,0 +1,196 @@
+import time
+import random
+import threading
+import requests
+from .config import FETCH_CONCURRENCY, FETCH_RETRIES, HTTP_POOL_SIZE, log
+from .transport import PooledAdapter, canvas_session
+
+# ─── Rate-Limited Request Scheduler ─────────────────────────────────────────
+
+# Only these are retried, a repeated POST / PUT could apply a change twice
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+GRAPHQL_PATH = "/api/graphql"
+
+def rate_limit_remaining(response):
+    """Canvas's X-Rate-Limit-Remaining of response as a float, None when it is missing"""
+    try:
+        return float(response.headers["X-Rate-Limit-Remaining"])
+    except (KeyError, ValueError):
+        return None
+
+def is_throttled(response):
+    """Canvas answers an empty rate limit bucket with 403 (Rate Limit Exceeded), some proxies with 429"""
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        b"Rate Limit Exceeded" in response.content or rate_limit_remaining(response) == 0
+    )
+
+def retry_after(response):
+    """Seconds from a numeric Retry-After header, None when there is none"""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+class RequestScheduler:
+    """Paces Canvas API requests by the rate limit headers of its responses.
+
+    Canvas gives every token a bucket of request cost, reports what is left in
+    X-Rate-Limit-Remaining (and the cost of each request in X-Request-Cost) and answers
+    403 Rate Limit Exceeded once it is empty. Requests in flight are limited to a window
+    that starts at max_concurrency, is halved when the bucket runs low or a request is
+    throttled, and grows back by one per window of responses while the bucket is healthy.
+    A throttled response holds every new request for a pause that doubles while responses
+    keep coming back throttled, so the whole client waits for the bucket to refill.
+    """
+
+    # Remaining bucket below which the window shrinks, and above which it may grow again
+    LOW_REMAINING = 150
+    HIGH_REMAINING = 400
+    # Responses already in flight report the same low bucket, they only cut the window once
+    DECREASE_INTERVAL = 1.0
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 30.0
+    # Total time one request may spend waiting out throttling before its 403 is returned
+    THROTTLE_MAX_WAIT = 300.0
+
+    def __init__(self, max_concurrency, retries):
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.retries = retries
+        self.stats = {"requests": 0, "retried": 0, "throttled": 0, "min_concurrency": max_concurrency, "min_remaining": None}
+        self._in_flight = 0
+        self._successes = 0
+        self._resume_at = 0.0
+        self._throttle_level = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot in the window (and the end of any throttling pause)"""
+        with self._cond:
+            while True:
+                wait = self._resume_at - time.monotonic()
+                if wait <= 0 and self._in_flight < self.limit:
+                    break
+                self._cond.wait(wait if wait > 0 else None)
+            self._in_flight += 1
+            self.stats["requests"] += 1
+
+    def release(self, response=None, throttled=False):
+        """Free the slot and resize the window from the response's rate limit headers.
+        Returns the pause a throttled response imposed on every new request."""
+        with self._cond:
+            self._in_flight -= 1
+            remaining = rate_limit_remaining(response) if response is not None else None
+            if remaining is not None and (self.stats["min_remaining"] is None or remaining < self.stats["min_remaining"]):
+                self.stats["min_remaining"] = remaining
+            pause = 0.0
+            if throttled:
+                self.stats["throttled"] += 1
+                self._decrease()
+                pause = self.backoff(self._throttle_level, response)
+                self._throttle_level += 1
+                self._resume_at = max(self._resume_at, time.monotonic() + pause)
+            else:
+                self._throttle_level = 0
+                if remaining is not None and remaining < self.LOW_REMAINING:
+                    self._decrease()
+                elif (remaining is None or remaining > self.HIGH_REMAINING) and self.limit < self.max_concurrency:
+                    self._successes += 1
+                    if self._successes >= self.limit:
+                        self._successes = 0
+                        self.limit += 1
+            self._cond.notify_all()
+            return pause
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._last_decrease < self.DECREASE_INTERVAL:
+            return
+        self._last_decrease = now
+        self._successes = 0
+        self.limit = max(1, self.limit // 2)
+        self.stats["min_concurrency"] = min(self.stats["min_concurrency"], self.limit)
+
+    def backoff(self, attempt, response=None):
+        """Delay before retry number attempt + 1: Retry-After when given, otherwise exponential with jitter"""
+        delay = retry_after(response) if response is not None else None
+        if delay is not None:
+            return min(delay, self.BACKOFF_MAX)
+        ceiling = min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** attempt)
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def note_retry(self):
+        with self._cond:
+            self.stats["retried"] += 1
+
+class SchedulingAdapter(PooledAdapter):
+    """Pooled transport adapter sending every request through a RequestScheduler.
+
+    It sits below any caching session, so responses served from the HTTP cache never
+    take a slot. Idempotent requests that fail with 5xx or lose their connection are
+    retried up to scheduler.retries times after a jittered backoff, throttled ones wait
+    out the scheduler's pause until THROTTLE_MAX_WAIT. Anything else is returned (or
+    raised) as is for canvasapi to turn into its exceptions.
+    """
+
+    def __init__(self, scheduler, pool_size=10, **kwargs):
+        super().__init__(pool_size, **kwargs)
+        self.scheduler = scheduler
+
+    def send(self, request, **kwargs):
+        scheduler = self.scheduler
+        # Only read-only queries are ever sent to /api/graphql, so those POSTs are safe to repeat
+        retry = request.method in IDEMPOTENT_METHODS or request.path_url == GRAPHQL_PATH
+        failures = 0
+        throttled_wait = 0.0
+        while True:
+            scheduler.acquire()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                scheduler.release()
+                if not retry or failures >= scheduler.retries:
+                    raise
+                delay = scheduler.backoff(failures)
+                failures += 1
+                reason = f"{type(e).__name__}, attempt {failures}/{scheduler.retries}"
+            else:
+                throttled = is_throttled(response)
+                pause = scheduler.release(response, throttled)
+                if throttled:
+                    if not retry or throttled_wait >= scheduler.THROTTLE_MAX_WAIT:
+                        return response
+                    # acquire() holds the retry until the pause is over, along with every other request
+                    delay = 0.0
+                    throttled_wait += pause
+                    reason = f"throttled, pausing requests for {pause:.1f}s"
+                elif response.status_code >= 500 and retry and failures < scheduler.retries:
+                    delay = scheduler.backoff(failures, response)
+                    failures += 1
+                    reason = f"HTTP {response.status_code}, attempt {failures}/{scheduler.retries}"
+                else:
+                    return response
+                response.close()
+            scheduler.note_retry()
+            log(f"🔁 Retrying {request.method} {request.path_url.split('?')[0]} ({reason})")
+            if delay:
+                time.sleep(delay)
+
+def install_request_scheduler(canvas):
+    """Mount a pooled SchedulingAdapter on the Canvas client's session, returns it (its
+    scheduler and stats hold the numbers of the run). Install it after install_http_cache,
+    which replaces the session. Without access to the session the adapter is returned
+    unmounted, requests then go through canvasapi's own session."""
+    adapter = SchedulingAdapter(RequestScheduler(FETCH_CONCURRENCY, FETCH_RETRIES), pool_size=HTTP_POOL_SIZE)
+    session = canvas_session(canvas)
+    if session is None:
+        return adapter
+    # requests' defaults, spelled out: a compressed body on every page and the connection kept open
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    session.headers["Connection"] = "keep-alive"
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
@@ -0,0 +1,203 @@
+import os
+import sqlite3
+from datetime import datetime, timezone
+from .config import CACHE_DIR, SNAPSHOT_STORE_ENABLED
+from .model import Assignment, parse_canvas_datetime
+
+# ─── Snapshot Store ─────────────────────────────────────────────────────────
+
+class SnapshotStore:
+    """SQLite history of students_data, one snapshot per run.
+
+    Students, courses and assignments are stored as rows keyed by run, with indexes on
+    student, course and due date, so a run can be re-rendered (load) or queried in slices
+    (iter_assignments) without keeping every run in memory. Timestamps are stored as UTC
+    ISO strings, which sort chronologically.
+    """
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(path)
+        # score / points_possible are left untyped so ints and floats round-trip as Canvas sent them
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS students (
+                run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+                student_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (run_id, student_id)
+            );
+            CREATE TABLE IF NOT EXISTS courses (
+                run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+                student_id INTEGER NOT NULL,
+                course_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                current_score,
+                final_score,
+                html_url TEXT,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (run_id, student_id, course_id)
+            );
+            CREATE TABLE IF NOT EXISTS assignments (
+                run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+                student_id INTEGER NOT NULL,
+                course_id INTEGER NOT NULL,
+                assignment_id INTEGER,
+                name TEXT,
+                due_at TEXT,
+                points_possible,
+                score,
+                grade TEXT,
+                missing INTEGER,
+                submitted_at TEXT,
+                html_url TEXT,
+                position INTEGER NOT NULL,
+                graded_at TEXT,
+                unlock_at TEXT,
+                lock_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS assignments_student ON assignments (run_id, student_id, course_id);
+            CREATE INDEX IF NOT EXISTS assignments_course ON assignments (course_id, run_id);
+            CREATE INDEX IF NOT EXISTS assignments_due_at ON assignments (run_id, due_at);
+        """)
+        # Stores created before graded_at / unlock_at / lock_at were tracked
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(assignments)")}
+        for column in ("graded_at", "unlock_at", "lock_at"):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE assignments ADD COLUMN {column} TEXT")
+        self._db.execute("PRAGMA foreign_keys = ON")
+
+    def save(self, students_data, created_at):
+        """Store students_data as a new run, returns its run id"""
+        with self._db:
+            run_id = self._db.execute(
+                "INSERT INTO runs (created_at) VALUES (?)", (created_at.astimezone(timezone.utc).isoformat(),)
+            ).lastrowid
+            for student_position, (student_id, student_data) in enumerate(students_data.items()):
+                self._db.execute(
+                    "INSERT INTO students VALUES (?, ?, ?, ?)",
+                    (run_id, student_id, student_data["name"], student_position)
+                )
+                for course_position, (course_id, course_data) in enumerate(student_data["courses"].items()):
+                    self._db.execute(
+                        "INSERT INTO courses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (run_id, student_id, course_id, course_data["name"], course_data["current_score"],
+                         course_data["final_score"], course_data["html_url"], course_position)
+                    )
+                    self._db.executemany(
+                        "INSERT INTO assignments (run_id, student_id, course_id, position, assignment_id, name, "
+                        "due_at, points_possible, score, grade, missing, submitted_at, graded_at, unlock_at, lock_at, html_url) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(run_id, student_id, course_id, position, a.id, a.name,
+                          self._utc_text(a.due_at), a.points_possible, a.score, a.grade,
+                          None if a.missing is None else int(a.missing),
+                          self._utc_text(a.submitted_at), self._utc_text(a.graded_at),
+                          self._utc_text(a.unlock_at), self._utc_text(a.lock_at), a.html_url)
+                         for position, a in enumerate(course_data["assignments"])]
+                    )
+        return run_id
+
+    @staticmethod
+    def _utc_text(value):
+        return value.astimezone(timezone.utc).isoformat() if value else None
+
+    def prune(self, keep):
+        """Drop all but the newest keep runs"""
+        with self._db:
+            self._db.execute(
+                "DELETE FROM runs WHERE run_id NOT IN (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?)", (keep,)
+            )
+
+    def latest_run_id(self, before=None):
+        """Return the newest run id (older than before, when given), or None"""
+        if before is None:
+            row = self._db.execute("SELECT MAX(run_id) FROM runs").fetchone()
+        else:
+            row = self._db.execute("SELECT MAX(run_id) FROM runs WHERE run_id < ?", (before,)).fetchone()
+        return row[0]
+
+    def run_created_at(self, run_id):
+        """Return the UTC datetime a run was taken at, or None for an unknown run"""
+        row = self._db.execute("SELECT created_at FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def iter_assignments(self, run_id, student_id=None, course_id=None, due_from=None, due_until=None):
+        """Yield (student_id, course_id, assignment) for one run, optionally narrowed by the indexes"""
+        query = (
+            "SELECT student_id, course_id, assignment_id, name, due_at, points_possible, score, grade, "
+            "missing, submitted_at, graded_at, unlock_at, lock_at, html_url FROM assignments WHERE run_id = ?"
+        )
+        params = [run_id]
+        if student_id is not None:
+            query += " AND student_id = ?"
+            params.append(student_id)
+        if course_id is not None:
+            query += " AND course_id = ?"
+            params.append(course_id)
+        if due_from is not None:
+            query += " AND due_at >= ?"
+            params.append(due_from.astimezone(timezone.utc).isoformat())
+        if due_until is not None:
+            query += " AND due_at <= ?"
+            params.append(due_until.astimezone(timezone.utc).isoformat())
+        query += " ORDER BY student_id, course_id, position"
+
+        for row in self._db.execute(query, params):
+            (row_student_id, row_course_id, assignment_id, name, due_at, points_possible, score, grade,
+             missing, submitted_at, graded_at, unlock_at, lock_at, html_url) = row
+            yield row_student_id, row_course_id, Assignment(
+                id=assignment_id,
+                name=name,
+                due_at=parse_canvas_datetime(due_at),
+                points_possible=points_possible,
+                score=score,
+                grade=grade,
+                missing=None if missing is None else bool(missing),
+                submitted_at=parse_canvas_datetime(submitted_at),
+                graded_at=parse_canvas_datetime(graded_at),
+                unlock_at=parse_canvas_datetime(unlock_at),
+                lock_at=parse_canvas_datetime(lock_at),
+                html_url=html_url
+            )
+
+    def load(self, run_id):
+        """Rebuild the students_data dict of a stored run"""
+        data = {}
+        for student_id, name in self._db.execute(
+            "SELECT student_id, name FROM students WHERE run_id = ? ORDER BY position", (run_id,)
+        ):
+            data[student_id] = {"name": name, "courses": {}}
+
+        for student_id, course_id, name, current_score, final_score, html_url in self._db.execute(
+            "SELECT student_id, course_id, name, current_score, final_score, html_url FROM courses "
+            "WHERE run_id = ? ORDER BY student_id, position", (run_id,)
+        ):
+            data[student_id]["courses"][course_id] = {
+                "name": name,
+                "current_score": current_score,
+                "final_score": final_score,
+                "assignments": [],
+                "html_url": html_url
+            }
+
+        for student_id, course_id, assignment in self.iter_assignments(run_id):
+            data[student_id]["courses"][course_id]["assignments"].append(assignment)
+        return data
+
+    def close(self):
+        self._db.close()
+
+def open_snapshot_store(required=False):
+    """Open the snapshot store in CACHE_DIR, returns None when it is disabled (and not
+    required, as for re-rendering a stored run) or unavailable"""
+    if not SNAPSHOT_STORE_ENABLED and not required:
+        return None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        return SnapshotStore(os.path.join(CACHE_DIR, "snapshots.sqlite"))
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️ Snapshot store unavailable: {e}")
+        return None